@@ -4,16 +4,20 @@ Professional Wi-Fi environmental intelligence system.
 """
 
 import sys
+import atexit
 import argparse
 import logging
-from typing import Dict, Optional, List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Optional, List, Sequence, Union
 
 # Import core modules
 from src.utils import load_config, setup_logging, ensure_directories, ComplianceValidator
 from src.collectors import DataCollectionOrchestrator
-from src.normalizers import DataNormalizationOrchestrator
+from src.normalizers import DataNormalizationOrchestrator, NormalizedObservation
 from src.storage import StorageOrchestrator
-from src.analysis import BaselineModel, TemporalAnalyzer, AnomalyDetector, EnvironmentalFingerprint, DistanceEstimator
+from src.analysis.result import AnalysisResult
 from src.reporting import ReportOrchestrator
 
 
@@ -48,47 +52,84 @@ class AmbientWifiMonitor:
         self.collector = DataCollectionOrchestrator(self.config, self.compliance)
         self.normalizer = DataNormalizationOrchestrator()
         self.storage = StorageOrchestrator(self.config)
+        self.reporter = ReportOrchestrator(self.config)
+        
+        # Analyzers are created on first analysis; status/baseline commands never need them
+        self._analysis_ready = False
+        
+        # Newest-first tail of saved observations, filled from disk on first use.
+        # _hist_obs_num is the observation number of the newest entry.
+        self._hist_cache: Optional[deque] = None
+        self._hist_obs_num = 0
+        
+        # Write out any buffered observations however the process exits
+        atexit.register(self.storage.flush)
+        
+        self.logger.info("Application initialized successfully")
+    
+    def _init_analysis(self) -> None:
+        """
+        Import and construct the analysis engines if not done already.
+        """
+        if self._analysis_ready:
+            return
+        
+        from src.analysis import (
+            BaselineModel, TemporalAnalyzer, AnomalyDetector,
+            EnvironmentalFingerprint, DistanceEstimator
+        )
+        
         self.baseline_model = BaselineModel(self.config)
         self.temporal_analyzer = TemporalAnalyzer(self.config)
         self.anomaly_detector = AnomalyDetector(self.config)
         self.fingerprinter = EnvironmentalFingerprint(self.config)
         self.distance_estimator = DistanceEstimator(self.config)
-        self.reporter = ReportOrchestrator(self.config)
         
-        self.logger.info("Application initialized successfully")
+        # The report-only analyzers are independent and run side by side
+        self._analysis_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix='analysis')
+        self._analysis_ready = True
     
-    def scan(self, save: bool = True, report: bool = True) -> Dict:
+    def scan(self, save: bool = True, report: bool = True) -> Union[AnalysisResult, Dict]:
         """
         Perform a single scan and analysis.
         
         Args:
-            save: Whether to save results to disk
+            save: Whether to save results to disk. A scan whose network scan
+                output was reused from the collector cache is never saved, so
+                the same scan is not stored as a second observation.
             report: Whether to generate reports
         
         Returns:
-            Analysis results dictionary
+            Analysis results, or a dictionary with 'success' False and an
+            'error' message if data collection failed
         """
         self.logger.info("Starting environmental scan")
         
-        # Collect data
-        raw_data = self.collector.collect_all()
+        # Collect and normalize data; each source is normalized as soon as
+        # its command returns, and raw output is only kept when it is saved
+        raw_data, normalized_data = self.collector.collect_and_normalize_all(self.normalizer, keep_raw=save)
         
         if not raw_data.get('success'):
             self.logger.error("Data collection failed")
             return {'success': False, 'error': 'Data collection failed'}
         
-        # Normalize data
-        normalized_data = self.normalizer.normalize_all(raw_data)
+        networks_raw = raw_data.get('wlan_networks', {})
+        if save and networks_raw.get('cached'):
+            self.logger.info(
+                "Network scan output reused from %s; not saved as a new observation",
+                networks_raw.get('timestamp')
+            )
+            save = False
         
         # Save observation
         if save:
-            obs_num = self.storage.save_observation(raw_data, normalized_data)
+            obs_num = self.storage.save_observation_buffered(raw_data, normalized_data)
+            self._remember_observation(normalized_data, obs_num)
         else:
-            metadata = self.storage.metadata_store.load()
-            obs_num = metadata.get('observation_count', 0) + 1
+            obs_num = self.storage.observation_count() + 1
         
         # Perform analysis
-        analysis_results = self._analyze_observation(normalized_data, obs_num)
+        analysis_results = self._analyze_observation(normalized_data, obs_num, report=report)
         
         # Generate reports
         if report:
@@ -98,35 +139,115 @@ class AmbientWifiMonitor:
             if 'text' in reports:
                 print("\n" + reports['text'])
             
-            # Save reports
+            # Save reports in the background; the next collection overlaps the write
             if save:
-                self.reporter.save_reports(reports, self.storage)
+                self.storage.submit_write(self.reporter.save_reports, reports, self.storage)
         
         self.logger.info("Scan completed successfully")
         
         return analysis_results
     
-    def _analyze_observation(self, observation: Dict, obs_num: int) -> Dict:
+    def _remember_observation(self, observation: Dict, obs_num: int) -> None:
+        """
+        Add a just-saved observation to the in-process history cache.
+        
+        If the observation number does not directly follow the cached one,
+        something else has written observations and the cache is dropped to
+        be reloaded from disk.
+        
+        Args:
+            observation: Normalized observation that was saved
+            obs_num: Its observation number
+        """
+        if self._hist_cache is not None and obs_num == self._hist_obs_num + 1:
+            self._hist_cache.appendleft(observation)
+            self._hist_obs_num = obs_num
+        else:
+            self._hist_cache = None
+    
+    def _recent_history(self, count: int, offset: int = 0) -> List[Dict]:
+        """
+        Get recent saved observations from the in-process history cache.
+        
+        Args:
+            count: Number of observations to return
+            offset: Number of newest observations to skip first
+        
+        Returns:
+            List of normalized observations, newest first
+        """
+        if self._hist_cache is None:
+            long_window = self.config.get('temporal', {}).get('long_term_window', 200)
+            self._hist_obs_num = self.storage.observation_count()
+            self._hist_cache = deque(
+                self.storage.normalized_store.load_recent(long_window), maxlen=long_window
+            )
+        
+        return list(islice(self._hist_cache, offset, offset + count))
+    
+    def _analyze_observation(self, observation: Dict, obs_num: int, report: bool = True) -> AnalysisResult:
         """
         Perform comprehensive analysis on an observation.
         
         Args:
             observation: Normalized observation dictionary
             obs_num: Observation number
+            report: Whether the results will be reported. When False, only
+                anomaly detection and baseline maintenance run; temporal,
+                fingerprint and distance results are left as None.
         
         Returns:
-            Complete analysis results dictionary
+            Complete analysis results
         """
-        self.logger.info(f"Analyzing observation #{obs_num}")
+        self.logger.info("Analyzing observation #%d", obs_num)
+        self._init_analysis()
+        current = NormalizedObservation.from_dict(observation)
+        
+        # Shared per-observation features, computed once for all analyzers
+        from src.analysis import derive_features
+        derive_features(observation)
         
         # Load baseline
         baseline = self.storage.baseline_store.load('current')
         
-        # Load historical observations
-        historical = self.storage.normalized_store.load_recent(
-            self.config.get('temporal', {}).get('long_term_window', 200)
+        # Load the recent observations first and run a fast anomaly pass on them
+        long_window = self.config.get('temporal', {}).get('long_term_window', 200)
+        fast_window = min(self.config.get('anomaly', {}).get('fast_window', 20), long_window)
+        recent = self._recent_history(fast_window)
+        anomaly_detection = self.anomaly_detector.detect_fast(observation, baseline, recent)
+        
+        # The rest of the long-term window is read only when something needs it:
+        # temporal analysis, an inconclusive fast pass, or baseline maintenance
+        update_interval = self.config.get('baseline', {}).get('update_interval', 10)
+        needs_long_window = (
+            (report and bool(recent))  # Temporal analysis runs whenever there is history
+            or anomaly_detection['suspect']
+            or baseline is None
+            or (report and 'fingerprint' not in baseline)
+            or obs_num % update_interval == 0
         )
         
+        if needs_long_window and len(recent) == fast_window:
+            # The recent window is a prefix of the long one; copy the cache once
+            historical = self._recent_history(long_window)
+        else:
+            historical = recent
+        
+        # Report-only analyses are skipped on headless/ingest-only runs. They
+        # share no state, so they run on the pool while the rest continues here.
+        if report:
+            pool = self._analysis_pool
+            temporal_future = (
+                pool.submit(self.temporal_analyzer.analyze, observation, historical)
+                if historical else None
+            )
+            fingerprint_future = pool.submit(self._fingerprint_analysis, observation, baseline, historical)
+            distance_future = pool.submit(self.distance_estimator.analyze_observation, observation)
+        
+        # Confirm a suspect fast pass against the full history
+        if anomaly_detection.pop('suspect'):
+            anomaly_detection = self.anomaly_detector.detect(observation, baseline, historical)
+        
         # Baseline comparison
         if baseline:
             baseline_comparison = self.baseline_model.compare_to_baseline(observation, baseline)
@@ -139,53 +260,69 @@ class AmbientWifiMonitor:
             baseline_comparison = {
                 'status': 'NO_BASELINE',
                 'confidence': 0.0,
-                'current_bssid_count': observation.get('wlan_networks', {}).get('summary', {}).get('bssid_count', 0)
+                'current_bssid_count': current.bssid_count
             }
             baseline_info = None
         
-        # Temporal analysis
-        if len(historical) > 0:
-            temporal_analysis = self.temporal_analyzer.analyze(observation, historical)
-        else:
-            temporal_analysis = None
+        # Gather the report-only analyses
+        temporal_analysis = None
+        fingerprint = None
+        baseline_fingerprint = None
+        fingerprint_comparison = None
+        distance_analysis = None
+        
+        if report:
+            if temporal_future is not None:
+                temporal_analysis = temporal_future.result()
+            fingerprint, baseline_fingerprint, fingerprint_comparison = fingerprint_future.result()
+            distance_analysis = distance_future.result()
         
-        # Anomaly detection
-        anomaly_detection = self.anomaly_detector.detect(observation, baseline, historical)
+        # Update baseline if needed
+        self._update_baseline_if_needed(historical, obs_num, baseline)
         
+        return AnalysisResult(
+            metadata={
+                'timestamp': current.timestamp,
+                'observation_number': obs_num
+            },
+            current_observation=observation,
+            baseline_info=baseline_info,
+            baseline_comparison=baseline_comparison,
+            temporal_analysis=temporal_analysis,
+            anomaly_detection=anomaly_detection,
+            fingerprint=fingerprint,
+            baseline_fingerprint=baseline_fingerprint,
+            fingerprint_comparison=fingerprint_comparison,
+            distance_analysis=distance_analysis
+        )
+    
+    def _fingerprint_analysis(self, observation: Dict, baseline: Optional[Dict],
+                              historical: Sequence[Dict]) -> tuple:
+        """
+        Generate the observation fingerprint and compare it to the baseline.
+        
+        Args:
+            observation: Normalized observation dictionary
+            baseline: Current baseline model, or None
+            historical: Historical observations (newest first)
+        
+        Returns:
+            Tuple of (fingerprint, baseline_fingerprint, fingerprint_comparison);
+            the last two are None without a baseline
+        """
         # Environmental fingerprint
         fingerprint = self.fingerprinter.generate(observation)
         
         # Compare fingerprint to baseline
-        if baseline:
-            baseline_fingerprint = self._get_or_create_baseline_fingerprint(baseline, historical)
-            fingerprint_comparison = self.fingerprinter.compare(fingerprint, baseline_fingerprint)
-        else:
-            baseline_fingerprint = None
-            fingerprint_comparison = None
+        if not baseline:
+            return fingerprint, None, None
         
-        # Distance estimation
-        distance_analysis = self.distance_estimator.analyze_observation(observation)
+        baseline_fingerprint = self._get_or_create_baseline_fingerprint(baseline, historical)
+        fingerprint_comparison = self.fingerprinter.compare(fingerprint, baseline_fingerprint)
         
-        # Update baseline if needed
-        self._update_baseline_if_needed(historical, obs_num)
-        
-        return {
-            'metadata': {
-                'timestamp': observation.get('timestamp'),
-                'observation_number': obs_num
-            },
-            'current_observation': observation,
-            'baseline_info': baseline_info,
-            'baseline_comparison': baseline_comparison,
-            'temporal_analysis': temporal_analysis,
-            'anomaly_detection': anomaly_detection,
-            'fingerprint': fingerprint,
-            'baseline_fingerprint': baseline_fingerprint,
-            'fingerprint_comparison': fingerprint_comparison,
-            'distance_analysis': distance_analysis
-        }
+        return fingerprint, baseline_fingerprint, fingerprint_comparison
     
-    def _get_or_create_baseline_fingerprint(self, baseline: Dict, historical: List[Dict]) -> Dict:
+    def _get_or_create_baseline_fingerprint(self, baseline: Dict, historical: Sequence[Dict]) -> Dict:
         """
         Get or create fingerprint for baseline.
         
@@ -196,42 +333,36 @@ class AmbientWifiMonitor:
         Returns:
             Baseline fingerprint dictionary
         """
-        # Check if baseline already has fingerprint
+        # Baselines persist their fingerprint at build time; older baseline
+        # files without one fall back to regenerating it below
         if 'fingerprint' in baseline:
             return baseline['fingerprint']
         
-        # Generate from historical observations used in baseline
+        # Generate from the observations used in the baseline, or all available
+        # history if fewer remain
         baseline_obs_count = baseline.get('observation_count', 0)
-        
-        if len(historical) >= baseline_obs_count:
-            # Use the observations that were in the baseline
-            baseline_obs = historical[:baseline_obs_count]
-            fingerprints = [self.fingerprinter.generate(obs) for obs in baseline_obs]
-            return self.fingerprinter.aggregate_fingerprints(fingerprints)
-        
-        # Fallback: use all available historical data
-        fingerprints = [self.fingerprinter.generate(obs) for obs in historical]
-        return self.fingerprinter.aggregate_fingerprints(fingerprints)
+        return self.fingerprinter.generate_batch(islice(historical, baseline_obs_count))
     
-    def _update_baseline_if_needed(self, historical: List[Dict], current_obs_num: int) -> None:
+    def _update_baseline_if_needed(self, historical: Sequence[Dict], current_obs_num: int,
+                                   baseline: Optional[Dict]) -> None:
         """
         Update baseline model if conditions are met.
         
         Args:
             historical: Historical observations
             current_obs_num: Current observation number
+            baseline: Current baseline model as already loaded for this scan
         """
         baseline_config = self.config.get('baseline', {})
         min_obs = baseline_config.get('min_observations', 100)
         update_interval = baseline_config.get('update_interval', 10)
         
         # Check if we should create/update baseline
-        baseline = self.storage.baseline_store.load('current')
-        
         if baseline is None and len(historical) >= min_obs:
             # Create initial baseline
-            self.logger.info(f"Creating initial baseline from {len(historical)} observations")
+            self.logger.info("Creating initial baseline from %d observations", len(historical))
             new_baseline = self.baseline_model.build(historical)
+            new_baseline['fingerprint'] = self.fingerprinter.generate_batch(historical)
             self.storage.baseline_store.save(new_baseline, 'current')
             
             # Update metadata
@@ -242,13 +373,55 @@ class AmbientWifiMonitor:
         
         elif baseline and current_obs_num % update_interval == 0:
             # Update existing baseline
-            self.logger.info(f"Updating baseline with {len(historical)} observations")
-            updated_baseline = self.baseline_model.build(historical)
+            self.logger.info("Updating baseline with %d observations", len(historical))
+            updated_baseline = self._refresh_baseline(baseline, historical)
+            updated_baseline['fingerprint'] = self.fingerprinter.generate_batch(historical)
             self.storage.baseline_store.save(updated_baseline, 'current')
             
             # Save previous baseline as backup
             self.storage.baseline_store.save(baseline, f'backup_{current_obs_num}')
     
+    def _refresh_baseline(self, baseline: Dict, historical: Sequence[Dict]) -> Dict:
+        """
+        Slide an existing baseline forward to the current history window.
+        
+        Uses the baseline's running state to apply only the observations that
+        entered or left the window since it was built. Falls back to a full
+        rebuild for baselines without state or when the expired observations
+        can no longer be read back.
+        
+        Args:
+            baseline: Existing baseline model
+            historical: Current history window (newest first)
+        
+        Returns:
+            Updated baseline model dictionary
+        """
+        state = baseline.get('state')
+        
+        if state and state.get('window_end'):
+            # Historical is newest first, so the new arrivals are a prefix
+            new_obs = [
+                obs for obs in historical
+                if (obs.get('timestamp') or '') > state['window_end']
+            ]
+            
+            # The old window now sits directly behind the new arrivals; anything
+            # of it beyond the current window has expired
+            expired_count = state['observations'] + len(new_obs) - len(historical)
+            expired = []
+            if expired_count > 0:
+                expired = self.storage.normalized_store.load_recent(
+                    expired_count, offset=len(historical)
+                )
+            
+            if len(expired) == max(expired_count, 0):
+                return self.baseline_model.update_incremental(baseline, new_obs, expired)
+            
+            self.logger.warning("Expired observations unavailable, rebuilding baseline")
+        
+        return self.baseline_model.build(historical)
+    
     def status(self) -> Dict:
         """
         Get current system status.
@@ -350,6 +523,8 @@ Examples:
     monitor_parser.add_argument('--interval', type=int, default=60, 
                                help='Scan interval in seconds (default: 60)')
     monitor_parser.add_argument('--count', type=int, help='Number of scans (default: unlimited)')
+    monitor_parser.add_argument('--quiet', action='store_true',
+                               help='Only collect and save observations; skip reports')
     
     # Status command
     status_parser = subparsers.add_parser('status', help='Show system status')
@@ -367,6 +542,8 @@ Examples:
         parser.print_help()
         return
     
+    app = None
+    
     try:
         # Initialize application
         app = AmbientWifiMonitor()
@@ -384,18 +561,25 @@ Examples:
             print("Press Ctrl+C to stop")
             print()
             
+            # Scans start on a fixed cadence measured from the start of the
+            # previous scan, so scan duration does not accumulate as drift
+            next_deadline = time.monotonic()
+            
             try:
                 while count < max_count:
                     count += 1
                     print(f"\n[Scan #{count}]")
-                    app.scan(save=True, report=True)
+                    app.scan(save=True, report=not args.quiet)
                     
                     if count < max_count:
-                        print(f"\nWaiting {args.interval} seconds...")
-                        time.sleep(args.interval)
+                        next_deadline = max(next_deadline + args.interval, time.monotonic())
+                        delay = next_deadline - time.monotonic()
+                        print(f"\nWaiting {delay:.1f} seconds...")
+                        time.sleep(max(0.0, delay))
             
             except KeyboardInterrupt:
                 print("\n\nMonitoring stopped by user")
+                app.storage.flush()
         
         elif args.command == 'status':
             status = app.status()
@@ -423,7 +607,7 @@ Examples:
             # Load last observation and generate report
             recent = app.storage.normalized_store.load_recent(1)
             if recent:
-                obs_num = app.storage.metadata_store.load().get('observation_count', 0)
+                obs_num = app.storage.observation_count()
                 analysis = app._analyze_observation(recent[0], obs_num)
                 reports = app.reporter.generate_reports(analysis)
                 
@@ -431,13 +615,18 @@ Examples:
                     print("\n" + reports['text'])
             else:
                 print("No observations found")
+        
+        # Write buffered observations (and report any failure) before exiting
+        app.storage.flush()
     
     except KeyboardInterrupt:
         print("\n\nOperation cancelled by user")
+        if app is not None:
+            app.storage.flush()
         sys.exit(0)
     
     except Exception as e:
-        logging.error(f"Application error: {e}", exc_info=True)
+        logging.error("Application error: %s", e, exc_info=True)
         print(f"\nError: {e}")
         sys.exit(1)
 
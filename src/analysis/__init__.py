@@ -1,20 +1,40 @@
 """
 Ambient Wi-Fi Monitor - Analysis Module
 Core analytical engines for Wi-Fi environmental intelligence.
+
+Submodules are imported on first attribute access (PEP 562), so commands
+that never analyze anything do not pay for NumPy/SciPy at startup.
 """
 
-from .baseline import BaselineModel, BaselineMetrics
-from .temporal import TemporalAnalyzer
-from .anomaly import AnomalyDetector
-from .fingerprint import EnvironmentalFingerprint
-from .distance import DistanceEstimator, DistanceZone
-
-__all__ = [
-    'BaselineModel',
-    'BaselineMetrics',
-    'TemporalAnalyzer',
-    'AnomalyDetector',
-    'EnvironmentalFingerprint',
-    'DistanceEstimator',
-    'DistanceZone'
-]
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'BaselineModel': 'baseline',
+    'BaselineMetrics': 'baseline',
+    'TemporalAnalyzer': 'temporal',
+    'AnomalyDetector': 'anomaly',
+    'EnvironmentalFingerprint': 'fingerprint',
+    'DistanceEstimator': 'distance',
+    'DistanceZone': 'distance',
+    'derive_features': 'features',
+    'bssid_columns': 'features',
+    'BssidColumns': 'features',
+    'AnalysisResult': 'result'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -5,8 +5,71 @@ Detects unusual patterns and deviations from expected behavior.
 
 import logging
 import numpy as np
-from typing import Dict, List, Optional, Tuple
-from scipy import stats
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .baseline import MAX_CHANNEL, channel_distribution_array, inverse_std
+from .features import derive_features
+
+
+# Sudden-change detection compares against the mean of the newest counts
+_SUDDEN_WINDOW = 5
+_SUDDEN_MIN_HISTORY = 3
+
+# Severity of a z-score anomaly, indexed by whether |z| exceeds 4
+_ZSCORE_SEVERITY = ('medium', 'high')
+
+
+class _DetectionContext(NamedTuple):
+    """
+    Values unpacked once per detect() call and shared by every detector.
+    """
+    current_count: int
+    bssid_total: int
+    signals: np.ndarray
+    channel_counts: Dict
+    metrics: Optional[Dict]
+    hist_counts: np.ndarray
+
+
+class _Detector:
+    """
+    A single anomaly check gated by cheap preconditions.
+    
+    detect() filters the registered detectors with applicable() before
+    running any of them, so checks that cannot produce a result (no baseline
+    yet, too little history) cost nothing.
+    """
+    
+    __slots__ = ('run', 'requires_baseline', 'min_history')
+    
+    def __init__(self, run: Callable, requires_baseline: bool = False,
+                 min_history: int = 0):
+        """
+        Initialize detector.
+        
+        Args:
+            run: Callable taking a _DetectionContext and returning an anomaly
+                dictionary, a list of them, or None
+            requires_baseline: Skip the detector when there is no baseline
+            min_history: Minimum number of historical observations required
+        """
+        self.run = run
+        self.requires_baseline = requires_baseline
+        self.min_history = min_history
+    
+    def applicable(self, ctx: _DetectionContext) -> bool:
+        """
+        Check whether the detector's preconditions hold for a context.
+        
+        Args:
+            ctx: Detection context
+        
+        Returns:
+            True if the detector should run
+        """
+        if self.requires_baseline and ctx.metrics is None:
+            return False
+        return ctx.hist_counts.size >= self.min_history
 
 
 class AnomalyDetector:
@@ -32,6 +95,32 @@ class AnomalyDetector:
         self.confidence_high = anomaly_config.get('confidence_high', 0.90)
         self.confidence_medium = anomaly_config.get('confidence_medium', 0.70)
         self.confidence_low = anomaly_config.get('confidence_low', 0.50)
+        
+        # Dense form of the last baseline channel distribution seen
+        self._channel_distribution = None
+        self._channel_array = None
+        
+        # Detectors in reporting order
+        self._detectors = (
+            # BSSID count anomalies
+            _Detector(lambda ctx: self._detect_bssid_count_anomaly(
+                ctx.current_count,
+                (ctx.metrics.get('bssid') or None) if ctx.metrics is not None else None,
+                ctx.hist_counts
+            )),
+            # Signal strength anomalies
+            _Detector(lambda ctx: self._detect_signal_anomaly(
+                ctx.signals, ctx.metrics.get('signal', {})
+            ), requires_baseline=True),
+            # Channel distribution anomalies
+            _Detector(lambda ctx: self._detect_channel_anomaly(
+                ctx.channel_counts, ctx.bssid_total, ctx.metrics.get('channel', {})
+            ), requires_baseline=True),
+            # Sudden appearance/disappearance
+            _Detector(lambda ctx: self._detect_sudden_changes(
+                ctx.current_count, ctx.hist_counts
+            ), min_history=_SUDDEN_MIN_HISTORY)
+        )
     
     def detect(self, current_observation: Dict, baseline: Optional[Dict], 
                historical_observations: List[Dict]) -> Dict:
@@ -48,35 +137,29 @@ class AnomalyDetector:
         """
         self.logger.info("Performing anomaly detection")
         
-        anomalies = []
-        
-        # BSSID count anomalies
-        bssid_anomaly = self._detect_bssid_count_anomaly(
-            current_observation, baseline, historical_observations
+        # Unpack the observation and baseline once for all detectors
+        derived = derive_features(current_observation)
+        ctx = _DetectionContext(
+            current_count=derived['bssid_count'],
+            bssid_total=len(current_observation.get('wlan_networks', {}).get('bssids', [])),
+            signals=derived['signals'],
+            channel_counts=derived['channel_counts'],
+            metrics=baseline.get('metrics', {}) if baseline else None,
+            # Historical BSSID counts, shared by the count and sudden-change detectors
+            hist_counts=np.fromiter(
+                (derive_features(obs)['bssid_count'] for obs in historical_observations),
+                dtype=np.int32, count=len(historical_observations)
+            )
         )
-        if bssid_anomaly:
-            anomalies.append(bssid_anomaly)
         
-        # Signal strength anomalies
-        signal_anomaly = self._detect_signal_anomaly(
-            current_observation, baseline, historical_observations
-        )
-        if signal_anomaly:
-            anomalies.append(signal_anomaly)
-        
-        # Channel distribution anomalies
-        channel_anomaly = self._detect_channel_anomaly(
-            current_observation, baseline
-        )
-        if channel_anomaly:
-            anomalies.append(channel_anomaly)
+        anomalies = []
         
-        # Sudden appearance/disappearance
-        disappearance_anomaly = self._detect_sudden_changes(
-            current_observation, historical_observations
-        )
-        if disappearance_anomaly:
-            anomalies.extend(disappearance_anomaly)
+        for detector in [d for d in self._detectors if d.applicable(ctx)]:
+            found = detector.run(ctx)
+            if isinstance(found, list):
+                anomalies.extend(found)
+            elif found:
+                anomalies.append(found)
         
         # Overall assessment
         if not anomalies:
@@ -98,56 +181,71 @@ class AnomalyDetector:
             'interpretation': self._interpret_anomalies(anomalies)
         }
     
-    def _detect_bssid_count_anomaly(self, current_observation: Dict, 
-                                     baseline: Optional[Dict],
-                                     historical_observations: List[Dict]) -> Optional[Dict]:
+    def detect_fast(self, current_observation: Dict, baseline: Optional[Dict],
+                    recent_observations: List[Dict]) -> Dict:
+        """
+        Run anomaly detection against a short window of recent history.
+        
+        With baseline BSSID metrics, historical data is only consulted for
+        sudden-change detection, which looks at the last few observations, so
+        the result here is final either way. The result is marked 'suspect'
+        when it should be confirmed with detect() on the full history: when
+        there are no baseline BSSID metrics and count statistics come from
+        history.
+        
+        Args:
+            current_observation: Current normalized observation
+            baseline: Baseline model (if available)
+            recent_observations: Short list of recent observations (newest first)
+        
+        Returns:
+            Anomaly detection results dictionary with an added 'suspect' flag
+        """
+        results = self.detect(current_observation, baseline, recent_observations)
+        results['suspect'] = baseline is None or not baseline.get('metrics', {}).get('bssid')
+        return results
+    
+    def _detect_bssid_count_anomaly(self, current_count: int,
+                                     bssid_metrics: Optional[Dict],
+                                     hist_counts: np.ndarray) -> Optional[Dict]:
         """
         Detect anomalies in BSSID count.
         
         Args:
-            current_observation: Current observation
-            baseline: Baseline model
-            historical_observations: Historical observations
+            current_count: Current BSSID count
+            bssid_metrics: Baseline BSSID metrics, or None without a baseline
+            hist_counts: Historical BSSID counts (newest first)
         
         Returns:
             Anomaly dictionary if detected, None otherwise
         """
-        networks = current_observation.get('wlan_networks', {})
-        summary = networks.get('summary', {})
-        current_count = summary.get('bssid_count', 0)
-        
         # Use baseline if available
-        if baseline:
-            metrics = baseline.get('metrics', {})
-            bssid_metrics = metrics.get('bssid', {})
+        if bssid_metrics is not None:
             mean = bssid_metrics.get('mean', 0)
-            std = bssid_metrics.get('std', 0)
+            inv_std = inverse_std(bssid_metrics)
         # Otherwise use historical data
-        elif len(historical_observations) >= 10:
-            counts = []
-            for obs in historical_observations:
-                obs_networks = obs.get('wlan_networks', {})
-                obs_summary = obs_networks.get('summary', {})
-                counts.append(obs_summary.get('bssid_count', 0))
-            mean = np.mean(counts)
-            std = np.std(counts)
+        elif hist_counts.size >= 10:
+            mean = float(hist_counts.sum()) / hist_counts.size
+            std = float(hist_counts.std())
+            inv_std = 1.0 / std if std > 0 else 0.0
         else:
             return None
         
         # Compute z-score
-        if std == 0:
+        if inv_std == 0:
             return None
         
-        z_score = (current_count - mean) / std
+        z_score = (current_count - mean) * inv_std
+        abs_z = abs(z_score)
         
         # Check if anomalous
-        if abs(z_score) >= self.zscore_threshold:
+        if abs_z >= self.zscore_threshold:
             direction = 'high' if z_score > 0 else 'low'
-            confidence = min(0.95, self.confidence_high + abs(z_score) * 0.01)
+            severity, confidence = self._score_to_severity(abs_z)
             
             return {
                 'type': 'bssid_count',
-                'severity': 'high' if abs(z_score) > 4 else 'medium',
+                'severity': severity,
                 'direction': direction,
                 'confidence': confidence,
                 'current_value': current_count,
@@ -158,43 +256,41 @@ class AnomalyDetector:
         
         return None
     
-    def _detect_signal_anomaly(self, current_observation: Dict,
-                                baseline: Optional[Dict],
-                                historical_observations: List[Dict]) -> Optional[Dict]:
+    def _score_to_severity(self, abs_z: float) -> Tuple[str, float]:
         """
-        Detect anomalies in signal strength distribution.
+        Map the magnitude of an anomalous z-score to severity and confidence.
         
         Args:
-            current_observation: Current observation
-            baseline: Baseline model
-            historical_observations: Historical observations
+            abs_z: Absolute z-score, already known to exceed the threshold
         
         Returns:
-            Anomaly dictionary if detected, None otherwise
+            Tuple of (severity, confidence)
         """
-        networks = current_observation.get('wlan_networks', {})
-        bssids = networks.get('bssids', [])
-        
-        current_signals = [b.get('signal') for b in bssids if b.get('signal') is not None]
-        
-        if not current_signals:
-            return None
+        return _ZSCORE_SEVERITY[int(abs_z > 4)], min(0.95, self.confidence_high + abs_z * 0.01)
+    
+    def _detect_signal_anomaly(self, current_signals: np.ndarray,
+                                signal_metrics: Optional[Dict]) -> Optional[Dict]:
+        """
+        Detect anomalies in signal strength distribution.
         
-        current_mean = np.mean(current_signals)
-        current_std = np.std(current_signals)
+        Args:
+            current_signals: Signal percentages of the current BSSIDs
+            signal_metrics: Baseline signal metrics, or None without a baseline
         
+        Returns:
+            Anomaly dictionary if detected, None otherwise
+        """
         # Compare to baseline
-        if baseline:
-            metrics = baseline.get('metrics', {})
-            signal_metrics = metrics.get('signal', {})
-            baseline_mean = signal_metrics.get('mean', 0)
-            baseline_std = signal_metrics.get('std', 0)
-        else:
+        if not current_signals.size or signal_metrics is None:
             return None
         
+        current_std = float(current_signals.std())
+        baseline_std = signal_metrics.get('std', 0)
+        inv_std = inverse_std(signal_metrics)
+        
         # Check if standard deviation is unusually high (unstable signals)
-        if baseline_std > 0:
-            std_ratio = current_std / baseline_std
+        if inv_std > 0:
+            std_ratio = current_std * inv_std
             
             if std_ratio > 2.0:
                 return {
@@ -209,88 +305,84 @@ class AnomalyDetector:
         
         return None
     
-    def _detect_channel_anomaly(self, current_observation: Dict,
-                                 baseline: Optional[Dict]) -> Optional[Dict]:
+    def _detect_channel_anomaly(self, channel_counts: Dict, bssid_total: int,
+                                 channel_metrics: Optional[Dict]) -> Optional[Dict]:
         """
         Detect anomalies in channel distribution.
         
         Args:
-            current_observation: Current observation
-            baseline: Baseline model
+            channel_counts: Current BSSID tally per channel
+            bssid_total: Current number of BSSIDs
+            channel_metrics: Baseline channel metrics, or None without a baseline
         
         Returns:
             Anomaly dictionary if detected, None otherwise
         """
-        if not baseline:
+        if channel_metrics is None:
             return None
         
-        networks = current_observation.get('wlan_networks', {})
-        bssids = networks.get('bssids', [])
-        
-        # Current channel distribution
-        current_channels = {}
-        for bssid in bssids:
-            channel = bssid.get('channel')
-            if channel:
-                current_channels[channel] = current_channels.get(channel, 0) + 1
+        # Current channel distribution, in order of first appearance
+        channels = np.fromiter((channel for channel in channel_counts if channel), dtype=np.intp)
         
-        if not current_channels:
+        if not channels.size:
             return None
         
         # Baseline channel distribution
-        metrics = baseline.get('metrics', {})
-        channel_metrics = metrics.get('channel', {})
         baseline_distribution = channel_metrics.get('channel_distribution', {})
         
         if not baseline_distribution:
             return None
         
-        # Check for new heavily-used channels
-        for channel, count in current_channels.items():
-            baseline_prop = baseline_distribution.get(str(channel), 0.0)
-            current_prop = count / len(bssids)
-            
-            # New channel with significant usage
-            if baseline_prop < 0.05 and current_prop > 0.20:
-                return {
-                    'type': 'channel_shift',
-                    'severity': 'medium',
-                    'confidence': 0.80,
-                    'channel': channel,
-                    'current_proportion': float(current_prop),
-                    'baseline_proportion': float(baseline_prop),
-                    'description': f"Unusual activity on channel {channel} ({current_prop*100:.1f}% vs baseline {baseline_prop*100:.1f}%)"
-                }
+        # The baseline is reused across scans, so expand it only when it changes
+        if baseline_distribution is not self._channel_distribution:
+            self._channel_array = channel_distribution_array(channel_metrics)
+            self._channel_distribution = baseline_distribution
         
-        return None
+        counts = np.fromiter((channel_counts[channel] for channel in channels.tolist()),
+                             dtype=np.float64, count=channels.size)
+        current_props = counts / bssid_total
+        in_range = (channels >= 0) & (channels < MAX_CHANNEL)
+        baseline_props = np.where(in_range, self._channel_array[np.where(in_range, channels, 0)], 0.0)
+        
+        # New channels with significant usage; report the first one seen
+        shifted = np.flatnonzero((baseline_props < 0.05) & (current_props > 0.20))
+        if not shifted.size:
+            return None
+        
+        first = shifted[0]
+        channel = int(channels[first])
+        current_prop = float(current_props[first])
+        baseline_prop = float(baseline_props[first])
+        
+        return {
+            'type': 'channel_shift',
+            'severity': 'medium',
+            'confidence': 0.80,
+            'channel': channel,
+            'current_proportion': current_prop,
+            'baseline_proportion': baseline_prop,
+            'description': f"Unusual activity on channel {channel} ({current_prop*100:.1f}% vs baseline {baseline_prop*100:.1f}%)"
+        }
     
-    def _detect_sudden_changes(self, current_observation: Dict,
-                                historical_observations: List[Dict]) -> List[Dict]:
+    def _detect_sudden_changes(self, current_count: int,
+                                hist_counts: np.ndarray) -> List[Dict]:
         """
         Detect sudden appearance or disappearance of many signals.
         
         Args:
-            current_observation: Current observation
-            historical_observations: Historical observations
+            current_count: Current BSSID count
+            hist_counts: Historical BSSID counts (newest first)
         
         Returns:
             List of anomaly dictionaries
         """
-        if len(historical_observations) < 3:
+        if hist_counts.size < _SUDDEN_MIN_HISTORY:
             return []
         
-        networks = current_observation.get('wlan_networks', {})
-        summary = networks.get('summary', {})
-        current_count = summary.get('bssid_count', 0)
-        
-        # Get recent counts
-        recent_counts = []
-        for obs in historical_observations[:5]:
-            obs_networks = obs.get('wlan_networks', {})
-            obs_summary = obs_networks.get('summary', {})
-            recent_counts.append(obs_summary.get('bssid_count', 0))
-        
-        recent_mean = np.mean(recent_counts)
+        # Mean of the most recent counts
+        # A view into the shared counts array; nothing is copied per call
+        recent_counts = hist_counts[:_SUDDEN_WINDOW]
+        recent_mean = float(recent_counts.sum()) / recent_counts.size
         
         anomalies = []
         
@@ -3,11 +3,71 @@ Ambient Wi-Fi Monitor - Baseline Analysis Module
 Builds and maintains statistical models of "normal" Wi-Fi environmental conditions.
 """
 
+import copy
 import logging
+import warnings
 import numpy as np
-from typing import Dict, List, Optional
+from bisect import bisect_right
+from collections import Counter
+from typing import Dict, List, Optional, Sequence
 from datetime import datetime
-from scipy import stats
+
+# compare_to_baseline bands: |z| < 1 normal, 1 <= |z| < 2 slight, |z| >= 2 anomalous
+_ZSCORE_BANDS = (1.0, 2.0)
+_BAND_STATUS = (
+    ('NORMAL', 'SLIGHTLY_REDUCED', 'ANOMALOUS_LOW'),
+    ('NORMAL', 'SLIGHTLY_ELEVATED', 'ANOMALOUS_HIGH')
+)
+_BAND_CONFIDENCE = (0.90, 0.75, 0.85)
+
+# Size of dense per-channel arrays; covers 2.4, 5 and 6 GHz channel numbers
+MAX_CHANNEL = 256
+
+
+def inverse_std(metrics: Dict) -> float:
+    """
+    Get the reciprocal standard deviation of a distribution metrics dictionary.
+    
+    Baselines store 'inv_std' so detectors multiply instead of dividing;
+    baselines saved before it existed fall back to 'std'.
+    
+    Args:
+        metrics: Distribution metrics, as produced by BaselineMetrics
+    
+    Returns:
+        1 / std, or 0.0 if the distribution has no spread
+    """
+    inv_std = metrics.get('inv_std')
+    if inv_std is None:
+        std = metrics.get('std', 0)
+        inv_std = 1.0 / std if std > 0 else 0.0
+    return inv_std
+
+
+def channel_distribution_array(channel_metrics: Dict) -> np.ndarray:
+    """
+    Expand a baseline channel distribution into a dense array.
+    
+    Baselines persist the distribution as a channel -> proportion mapping
+    keyed by string; the dense form lets detectors index it by channel number.
+    
+    Args:
+        channel_metrics: Baseline channel metrics, as produced by BaselineMetrics
+    
+    Returns:
+        Float64 array of length MAX_CHANNEL holding each channel's proportion
+    """
+    dense = np.zeros(MAX_CHANNEL, dtype=np.float64)
+    
+    for channel, proportion in channel_metrics.get('channel_distribution', {}).items():
+        try:
+            index = int(channel)
+        except (TypeError, ValueError):
+            continue
+        if 0 <= index < MAX_CHANNEL:
+            dense[index] = proportion
+    
+    return dense
 
 
 class BaselineMetrics:
@@ -18,38 +78,72 @@ class BaselineMetrics:
     def __init__(self):
         self.logger = logging.getLogger('ambient_wifi_monitor.analysis.baseline.metrics')
     
-    def compute_bssid_metrics(self, observations: List[Dict]) -> Dict:
+    def extract_columns(self, observations: List[Dict]) -> Dict:
         """
-        Compute baseline metrics for BSSID counts.
+        Extract every per-observation quantity the metrics need in one pass.
         
         Args:
             observations: List of normalized observation dictionaries
         
         Returns:
-            Dictionary of baseline BSSID metrics
+            Dictionary with 'counts' (BSSID count per observation) and
+            'signals' (all reported signal percentages) as contiguous float64
+            arrays, plus 'channel_counts' (channel -> BSSID tally) and
+            'ssid_counts' (SSID -> number of observations it appeared in)
         """
-        counts = []
+        counts = np.empty(len(observations), dtype=np.float64)
+        signals = []
+        channel_counts = Counter()
+        ssid_counts = Counter()
         
-        for obs in observations:
+        for i, obs in enumerate(observations):
             networks = obs.get('wlan_networks', {})
             summary = networks.get('summary', {})
-            count = summary.get('bssid_count', 0)
-            counts.append(count)
+            counts[i] = summary.get('bssid_count', 0)
+            
+            bssids = networks.get('bssids', [])
+            signals.extend(b['signal'] for b in bssids if b.get('signal') is not None)
+            channel_counts.update(b['channel'] for b in bssids if b.get('channel') is not None)
+            
+            # Exclude empty SSIDs
+            ssid_counts.update(ssid for ssid in summary.get('ssids', []) if ssid)
         
-        if not counts:
-            return {}
+        return {
+            'counts': counts,
+            'signals': np.asarray(signals, dtype=np.float64),
+            'channel_counts': channel_counts,
+            'ssid_counts': ssid_counts
+        }
+    
+    def compute_metrics(self, columns: Dict) -> Dict:
+        """
+        Compute all baseline metrics from extracted columns.
         
+        Args:
+            columns: Output of extract_columns()
+        
+        Returns:
+            Dictionary with 'bssid', 'signal', 'channel' and 'ssid' metrics
+        """
         return {
-            'mean': float(np.mean(counts)),
-            'median': float(np.median(counts)),
-            'std': float(np.std(counts)),
-            'min': int(np.min(counts)),
-            'max': int(np.max(counts)),
-            'percentile_25': float(np.percentile(counts, 25)),
-            'percentile_75': float(np.percentile(counts, 75)),
-            'samples': len(counts)
+            'bssid': self._summary_stats(columns['counts']),
+            'signal': self._summary_stats(columns['signals']),
+            'channel': self.summarize_channel_counts(columns['channel_counts']),
+            'ssid': self.summarize_ssid_counts(columns['ssid_counts'])
         }
     
+    def compute_bssid_metrics(self, observations: List[Dict]) -> Dict:
+        """
+        Compute baseline metrics for BSSID counts.
+        
+        Args:
+            observations: List of normalized observation dictionaries
+        
+        Returns:
+            Dictionary of baseline BSSID metrics
+        """
+        return self._summary_stats(self.extract_columns(observations)['counts'])
+    
     def compute_signal_metrics(self, observations: List[Dict]) -> Dict:
         """
         Compute baseline metrics for signal strength (as percentage).
@@ -60,29 +154,47 @@ class BaselineMetrics:
         Returns:
             Dictionary of baseline signal metrics
         """
-        signals = []
+        return self._summary_stats(self.extract_columns(observations)['signals'])
+    
+    def _summary_stats(self, values: np.ndarray) -> Dict:
+        """
+        Compute distribution metrics over a contiguous array of values.
         
-        for obs in observations:
-            networks = obs.get('wlan_networks', {})
-            bssids = networks.get('bssids', [])
-            
-            for bssid in bssids:
-                signal = bssid.get('signal')
-                if signal is not None:
-                    signals.append(signal)
+        Mean and standard deviation come from the sum and sum of squares.
+        Median, quartiles and range come from a single np.partition call,
+        interpolated the same way as np.percentile.
         
-        if not signals:
+        Args:
+            values: One-dimensional array of integer-valued samples
+        
+        Returns:
+            Dictionary of distribution metrics, empty if there are no values
+        """
+        n = values.size
+        if not n:
             return {}
         
+        total = values.sum()
+        total_sq = np.dot(values, values)
+        
+        # Order statistics around the 25th/50th/75th percentiles, plus the extremes
+        positions = (n - 1) * np.array([0.25, 0.5, 0.75])
+        lower = np.floor(positions).astype(np.intp)
+        upper = np.minimum(lower + 1, n - 1)
+        partitioned = np.partition(values, np.unique(np.concatenate(([0, n - 1], lower, upper))))
+        quartiles = partitioned[lower] + (positions - lower) * (partitioned[upper] - partitioned[lower])
+        std = float(np.sqrt(max(n * total_sq - total * total, 0.0)) / n)
+        
         return {
-            'mean': float(np.mean(signals)),
-            'median': float(np.median(signals)),
-            'std': float(np.std(signals)),
-            'min': int(np.min(signals)),
-            'max': int(np.max(signals)),
-            'percentile_25': float(np.percentile(signals, 25)),
-            'percentile_75': float(np.percentile(signals, 75)),
-            'samples': len(signals)
+            'mean': float(total / n),
+            'median': float(quartiles[1]),
+            'std': std,
+            'inv_std': 1.0 / std if std > 0 else 0.0,
+            'min': int(partitioned[0]),
+            'max': int(partitioned[n - 1]),
+            'percentile_25': float(quartiles[0]),
+            'percentile_75': float(quartiles[2]),
+            'samples': int(n)
         }
     
     def compute_channel_metrics(self, observations: List[Dict]) -> Dict:
@@ -95,17 +207,18 @@ class BaselineMetrics:
         Returns:
             Dictionary of baseline channel metrics
         """
-        channel_counts = {}
+        return self.summarize_channel_counts(self.extract_columns(observations)['channel_counts'])
+    
+    def summarize_channel_counts(self, channel_counts: Dict) -> Dict:
+        """
+        Compute channel usage metrics from per-channel BSSID tallies.
         
-        for obs in observations:
-            networks = obs.get('wlan_networks', {})
-            bssids = networks.get('bssids', [])
-            
-            for bssid in bssids:
-                channel = bssid.get('channel')
-                if channel is not None:
-                    channel_counts[channel] = channel_counts.get(channel, 0) + 1
+        Args:
+            channel_counts: Mapping of channel number to observation count
         
+        Returns:
+            Dictionary of baseline channel metrics
+        """
         if not channel_counts:
             return {}
         
@@ -119,7 +232,9 @@ class BaselineMetrics:
             'channel_distribution': channel_distribution,
             'unique_channels': len(channel_counts),
             'most_common_channel': max(channel_counts, key=channel_counts.get),
-            'channel_diversity': self._compute_diversity(list(channel_distribution.values()))
+            'channel_diversity': self._compute_diversity(
+                np.fromiter(channel_counts.values(), dtype=np.float64, count=len(channel_counts))
+            )
         }
     
     def compute_ssid_metrics(self, observations: List[Dict]) -> Dict:
@@ -132,45 +247,93 @@ class BaselineMetrics:
         Returns:
             Dictionary of baseline SSID metrics
         """
-        ssid_counts = {}
+        return self.summarize_ssid_counts(self.extract_columns(observations)['ssid_counts'])
+    
+    def summarize_ssid_counts(self, ssid_counts: Dict) -> Dict:
+        """
+        Compute SSID diversity metrics from per-SSID tallies.
         
-        for obs in observations:
-            networks = obs.get('wlan_networks', {})
-            summary = networks.get('summary', {})
-            ssids = summary.get('ssids', [])
-            
-            for ssid in ssids:
-                if ssid:  # Exclude empty SSIDs
-                    ssid_counts[ssid] = ssid_counts.get(ssid, 0) + 1
+        Args:
+            ssid_counts: Mapping of SSID to number of observations it appeared in
         
+        Returns:
+            Dictionary of baseline SSID metrics
+        """
         if not ssid_counts:
             return {}
         
         return {
             'unique_ssids': len(ssid_counts),
             'total_ssid_observations': sum(ssid_counts.values()),
-            'ssid_diversity': self._compute_diversity(list(ssid_counts.values()))
+            'ssid_diversity': self._compute_diversity(
+                np.fromiter(ssid_counts.values(), dtype=np.float64, count=len(ssid_counts))
+            )
         }
     
-    def _compute_diversity(self, counts: List[float]) -> float:
+    def summarize_running_stats(self, running: Dict) -> Dict:
+        """
+        Compute distribution metrics from a running accumulator.
+        
+        Mean and standard deviation come from the running sums; median,
+        quartiles and range come from the value histogram. Both are exact
+        because BSSID counts and signal percentages are integers.
+        
+        Args:
+            running: Accumulator with 'n', 'sum', 'sum_sq' and 'histogram' keys
+        
+        Returns:
+            Dictionary of metrics in the same shape as compute_bssid_metrics
+        """
+        n = running.get('n', 0)
+        histogram = running.get('histogram', {})
+        
+        if n <= 0 or not histogram:
+            return {}
+        
+        pairs = sorted((int(value), count) for value, count in histogram.items())
+        values = np.array([value for value, _ in pairs], dtype=np.float64)
+        cumulative = np.cumsum([count for _, count in pairs])
+        
+        def quantile(q: float) -> float:
+            # Linear interpolation between order statistics, matching np.percentile
+            position = (n - 1) * q
+            lower = int(np.floor(position))
+            upper = min(lower + 1, n - 1)
+            lower_value = values[np.searchsorted(cumulative, lower, side='right')]
+            upper_value = values[np.searchsorted(cumulative, upper, side='right')]
+            return float(lower_value + (position - lower) * (upper_value - lower_value))
+        
+        std = float(np.sqrt(max(n * running['sum_sq'] - running['sum'] ** 2, 0) / n ** 2))
+        
+        return {
+            'mean': running['sum'] / n,
+            'median': quantile(0.5),
+            'std': std,
+            'inv_std': 1.0 / std if std > 0 else 0.0,
+            'min': int(values[0]),
+            'max': int(values[-1]),
+            'percentile_25': quantile(0.25),
+            'percentile_75': quantile(0.75),
+            'samples': n
+        }
+    
+    def _compute_diversity(self, counts: np.ndarray) -> float:
         """
         Compute Shannon diversity index.
         
         Args:
-            counts: List of occurrence counts
+            counts: Array of occurrence counts (or proportions)
         
         Returns:
             Shannon diversity index
         """
-        if not counts:
+        counts = np.asarray(counts, dtype=np.float64)
+        counts = counts[counts > 0]
+        if not counts.size:
             return 0.0
         
-        total = sum(counts)
-        if total == 0:
-            return 0.0
-        
-        proportions = [c / total for c in counts if c > 0]
-        return float(-sum(p * np.log(p) for p in proportions))
+        proportions = counts / counts.sum()
+        return float(-np.dot(proportions, np.log(proportions)))
 
 
 class BaselineModel:
@@ -208,29 +371,27 @@ class BaselineModel:
         """
         if len(observations) < self.min_observations:
             self.logger.warning(
-                f"Insufficient observations for baseline: {len(observations)} < {self.min_observations}"
+                "Insufficient observations for baseline: %d < %d", len(observations), self.min_observations
             )
             return self._create_provisional_baseline(observations)
         
-        self.logger.info(f"Building baseline from {len(observations)} observations")
+        self.logger.info("Building baseline from %d observations", len(observations))
+        
+        # One pass over the observations feeds every metric
+        columns = self.metrics_calculator.extract_columns(observations)
+        state = self._seed_state(observations, columns)
         
         baseline = {
             'created': datetime.now().isoformat(),
             'observation_count': len(observations),
             'status': 'stable',
-            'confidence': self._compute_confidence(observations),
-            'metrics': {
-                'bssid': self.metrics_calculator.compute_bssid_metrics(observations),
-                'signal': self.metrics_calculator.compute_signal_metrics(observations),
-                'channel': self.metrics_calculator.compute_channel_metrics(observations),
-                'ssid': self.metrics_calculator.compute_ssid_metrics(observations)
-            },
-            'temporal_patterns': self._analyze_temporal_patterns(observations)
+            'confidence': self._compute_confidence(columns['counts']),
+            'metrics': self.metrics_calculator.compute_metrics(columns),
+            'temporal_patterns': self._temporal_patterns(state),
+            'state': state
         }
         
-        self.logger.info(
-            f"Baseline created with confidence {baseline['confidence']:.2f}"
-        )
+        self.logger.info("Baseline created with confidence %.2f", baseline['confidence'])
         
         return baseline
     
@@ -244,48 +405,41 @@ class BaselineModel:
         Returns:
             Provisional baseline dictionary
         """
-        self.logger.info(f"Creating provisional baseline from {len(observations)} observations")
+        self.logger.info("Creating provisional baseline from %d observations", len(observations))
+        
+        columns = self.metrics_calculator.extract_columns(observations)
         
         return {
             'created': datetime.now().isoformat(),
             'observation_count': len(observations),
             'status': 'provisional',
             'confidence': 0.5,  # Lower confidence for provisional baseline
-            'metrics': {
-                'bssid': self.metrics_calculator.compute_bssid_metrics(observations),
-                'signal': self.metrics_calculator.compute_signal_metrics(observations),
-                'channel': self.metrics_calculator.compute_channel_metrics(observations),
-                'ssid': self.metrics_calculator.compute_ssid_metrics(observations)
-            },
+            'metrics': self.metrics_calculator.compute_metrics(columns),
             'temporal_patterns': {},
+            'state': self._seed_state(observations, columns),
             'note': f'Provisional baseline - requires {self.min_observations} observations for stability'
         }
     
-    def _compute_confidence(self, observations: List[Dict]) -> float:
+    def _compute_confidence(self, counts: np.ndarray) -> float:
         """
         Compute confidence score for baseline stability.
         
         Args:
-            observations: List of normalized observation dictionaries
+            counts: BSSID count of each observation
         
         Returns:
             Confidence score (0.0 - 1.0)
         """
-        if len(observations) < self.min_observations:
+        if len(counts) < self.min_observations:
             return 0.5
         
         # Check coefficient of variation for BSSID counts
-        counts = []
-        for obs in observations:
-            networks = obs.get('wlan_networks', {})
-            summary = networks.get('summary', {})
-            count = summary.get('bssid_count', 0)
-            counts.append(count)
-        
-        if not counts or np.mean(counts) == 0:
+        n = counts.size
+        mean = float(counts.sum()) / n if n else 0.0
+        if mean == 0:
             return 0.6
         
-        cv = np.std(counts) / np.mean(counts)
+        cv = float(counts.std()) / mean
         
         # Lower CV means more stable, higher confidence
         # CV < 0.2 -> very stable (confidence ~0.95)
@@ -294,56 +448,300 @@ class BaselineModel:
         
         return float(confidence)
     
-    def _analyze_temporal_patterns(self, observations: List[Dict]) -> Dict:
+    def _temporal_patterns(self, state: Dict) -> Dict:
         """
-        Analyze temporal patterns in observations.
+        Analyze temporal patterns from the hourly tallies of a running state.
         
         Args:
-            observations: List of normalized observation dictionaries
+            state: Running state dictionary
         
         Returns:
             Dictionary of temporal patterns
         """
-        # Extract timestamps and BSSID counts
-        time_series = []
+        if state['timestamped'] < 10:
+            return {}
         
-        for obs in observations:
-            timestamp_str = obs.get('timestamp')
-            networks = obs.get('wlan_networks', {})
-            summary = networks.get('summary', {})
-            count = summary.get('bssid_count', 0)
-            
-            if timestamp_str:
+        return {
+            'hourly_means': {
+                int(hour): total / count
+                for hour, (total, count) in sorted(state['hourly'].items(), key=lambda x: int(x[0]))
+            },
+            'has_temporal_data': True
+        }
+    
+    def _observation_hours(self, observations: Sequence[Dict]) -> np.ndarray:
+        """
+        Extract the hour of day of each observation's timestamp.
+        
+        Args:
+            observations: Normalized observation dictionaries
+        
+        Returns:
+            Array of hours (0-23), -1 where an observation has no timestamp or
+            it could not be parsed
+        """
+        hours = np.full(len(observations), -1, dtype=np.intp)
+        index = [i for i, obs in enumerate(observations) if obs.get('timestamp')]
+        if index:
+            hours[index] = self._timestamp_hours([observations[i]['timestamp'] for i in index])
+        return hours
+    
+    def _timestamp_hours(self, timestamps: List[str]) -> np.ndarray:
+        """
+        Extract the hour of day of ISO timestamps in one vectorized parse.
+        
+        Timestamps NumPy cannot parse on its own (UTC offsets, which it would
+        convert, or malformed strings) send the batch through
+        datetime.fromisoformat instead, keeping the hour as written.
+        
+        Args:
+            timestamps: ISO 8601 timestamp strings
+        
+        Returns:
+            Array of hours (0-23), -1 where a timestamp could not be parsed
+        """
+        if not timestamps:
+            return np.empty(0, dtype=np.intp)
+        
+        try:
+            with warnings.catch_warnings():
+                # NumPy only warns when it converts an offset to UTC
+                warnings.simplefilter('error')
+                stamps = np.char.replace(np.asarray(timestamps), 'Z', '').astype('datetime64[us]')
+        except (TypeError, ValueError, UserWarning):
+            hours = np.empty(len(timestamps), dtype=np.intp)
+            for i, timestamp_str in enumerate(timestamps):
                 try:
-                    dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                    time_series.append((dt, count))
-                except:
-                    pass
+                    hours[i] = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00')).hour
+                except (AttributeError, ValueError):
+                    hours[i] = -1
+            return hours
         
-        if len(time_series) < 10:
-            return {}
+        return (stamps.astype('datetime64[h]').astype(np.int64) % 24).astype(np.intp)
+    
+    def update_incremental(self, old_baseline: Dict, new_obs: List[Dict],
+                           expired_obs: Sequence[Dict] = ()) -> Dict:
+        """
+        Update a baseline by streaming observations into its running state.
         
-        # Sort by time
-        time_series.sort(key=lambda x: x[0])
+        The running state stored in the baseline is adjusted by adding the
+        observations that arrived since it was built and, for a sliding
+        window, removing the ones that fell out of it. The cost scales with
+        the number of changed observations rather than the window size.
         
-        # Analyze hourly patterns (if we have enough data)
-        hourly_counts = {}
-        for dt, count in time_series:
-            hour = dt.hour
-            if hour not in hourly_counts:
-                hourly_counts[hour] = []
-            hourly_counts[hour].append(count)
+        Args:
+            old_baseline: Baseline model dictionary containing a 'state' entry
+            new_obs: Observations entering the window
+            expired_obs: Observations leaving the window (none for a growing
+                window)
         
-        hourly_means = {
-            hour: np.mean(counts)
-            for hour, counts in hourly_counts.items()
+        Returns:
+            Updated baseline model dictionary
+        """
+        state = copy.deepcopy(old_baseline['state'])
+        
+        for obs, hour in zip(expired_obs, self._observation_hours(expired_obs)):
+            self._apply_observation(state, obs, int(hour), -1)
+        for obs, hour in zip(new_obs, self._observation_hours(new_obs)):
+            self._apply_observation(state, obs, int(hour), 1)
+        
+        timestamps = [obs.get('timestamp') for obs in new_obs if obs.get('timestamp')]
+        if state.get('window_end'):
+            timestamps.append(state['window_end'])
+        state['window_end'] = max(timestamps) if timestamps else None
+        
+        observation_count = state['observations']
+        self.logger.info(
+            "Incrementally updating baseline: -%d +%d observations (%d in window)",
+            len(expired_obs), len(new_obs), observation_count
+        )
+        
+        metrics = {
+            'bssid': self.metrics_calculator.summarize_running_stats(state['bssid']),
+            'signal': self.metrics_calculator.summarize_running_stats(state['signal']),
+            'channel': self.metrics_calculator.summarize_channel_counts(
+                {int(ch): count for ch, count in state['channel'].items()}
+            ),
+            'ssid': self.metrics_calculator.summarize_ssid_counts(state['ssid'])
         }
         
+        if observation_count < self.min_observations:
+            return {
+                'created': datetime.now().isoformat(),
+                'observation_count': observation_count,
+                'status': 'provisional',
+                'confidence': 0.5,
+                'metrics': metrics,
+                'temporal_patterns': {},
+                'state': state,
+                'note': f'Provisional baseline - requires {self.min_observations} observations for stability'
+            }
+        
+        # Same stability rule as _compute_confidence, from the running moments
+        bssid_metrics = metrics['bssid']
+        if not bssid_metrics or bssid_metrics['mean'] == 0:
+            confidence = 0.6
+        else:
+            cv = bssid_metrics['std'] / bssid_metrics['mean']
+            confidence = float(max(0.70, min(0.95, 0.95 - cv)))
+        
+        temporal_patterns = self._temporal_patterns(state)
+        
         return {
-            'hourly_means': hourly_means,
-            'has_temporal_data': True
+            'created': datetime.now().isoformat(),
+            'observation_count': observation_count,
+            'status': 'stable',
+            'confidence': confidence,
+            'metrics': metrics,
+            'temporal_patterns': temporal_patterns,
+            'state': state
+        }
+    
+    def _seed_state(self, observations: List[Dict], columns: Optional[Dict] = None) -> Dict:
+        """
+        Build the running state used for incremental baseline updates.
+        
+        Args:
+            observations: List of normalized observation dictionaries
+            columns: Output of BaselineMetrics.extract_columns() for the same
+                observations, if already computed
+        
+        Returns:
+            JSON-serializable running state dictionary
+        """
+        if columns is None:
+            columns = self.metrics_calculator.extract_columns(observations)
+        
+        # Hourly tallies from one vectorized timestamp parse
+        hours = self._observation_hours(observations)
+        timed = hours >= 0
+        hour_totals = np.bincount(hours[timed], weights=columns['counts'][timed], minlength=24)
+        hour_tallies = np.bincount(hours[timed], minlength=24)
+        
+        timestamps = [obs['timestamp'] for obs in observations if obs.get('timestamp')]
+        
+        # Distribution accumulators seeded from the extracted columns in bulk
+        state = {
+            'observations': len(observations),
+            'window_end': max(timestamps) if timestamps else None,
+            'bssid': self._seed_running(columns['counts']),
+            'signal': self._seed_running(columns['signals']),
+            'channel': {str(ch): count for ch, count in columns['channel_counts'].items()},
+            'ssid': dict(columns['ssid_counts']),
+            'hourly': {
+                str(hour): [int(hour_totals[hour]), int(hour_tallies[hour])]
+                for hour in np.flatnonzero(hour_tallies)
+            },
+            'timestamped': int(np.count_nonzero(timed))
+        }
+        
+        return state
+    
+    def _seed_running(self, values: np.ndarray) -> Dict:
+        """
+        Build a running accumulator from an array of integer-valued samples.
+        
+        Args:
+            values: Sample values
+        
+        Returns:
+            Accumulator with 'n', 'sum', 'sum_sq' and 'histogram' keys
+        """
+        unique, frequency = np.unique(values, return_counts=True)
+        
+        return {
+            'n': int(values.size),
+            'sum': int(values.sum()),
+            'sum_sq': int(np.dot(values, values)),
+            'histogram': {str(int(value)): int(count) for value, count in zip(unique, frequency)}
         }
     
+    def _apply_observation(self, state: Dict, obs: Dict, hour: int, sign: int) -> None:
+        """
+        Add (sign=1) or remove (sign=-1) one observation from the running state.
+        
+        Args:
+            state: Running state dictionary, modified in place
+            obs: Normalized observation dictionary
+            hour: Hour of day of the observation's timestamp, -1 if it has none
+            sign: 1 to add the observation, -1 to remove it
+        """
+        networks = obs.get('wlan_networks', {})
+        summary = networks.get('summary', {})
+        count = summary.get('bssid_count', 0)
+        
+        state['observations'] += sign
+        self._update_running(state['bssid'], count, sign)
+        
+        for bssid in networks.get('bssids', []):
+            signal = bssid.get('signal')
+            if signal is not None:
+                self._update_running(state['signal'], signal, sign)
+            
+            channel = bssid.get('channel')
+            if channel is not None:
+                self._update_counter(state['channel'], str(channel), sign)
+        
+        for ssid in summary.get('ssids', []):
+            if ssid:  # Exclude empty SSIDs
+                self._update_counter(state['ssid'], ssid, sign)
+        
+        if hour >= 0:
+            self._apply_hourly(state, hour, count, sign)
+    
+    def _apply_hourly(self, state: Dict, hour: int, count: int, sign: int) -> None:
+        """
+        Add or remove one observation's BSSID count from the hourly tallies.
+        
+        Args:
+            state: Running state dictionary, modified in place
+            hour: Hour of day of the observation's timestamp
+            count: BSSID count of the observation
+            sign: 1 to add the observation, -1 to remove it
+        """
+        hour = str(hour)
+        total, hour_count = state['hourly'].get(hour, (0, 0))
+        total += sign * count
+        hour_count += sign
+        if hour_count > 0:
+            state['hourly'][hour] = [total, hour_count]
+        else:
+            state['hourly'].pop(hour, None)
+        state['timestamped'] += sign
+    
+    def _update_running(self, running: Dict, value: int, sign: int) -> None:
+        """
+        Add or remove one sample from a running accumulator.
+        
+        Samples are integers, so the sums are kept as exact integers and
+        repeated add/remove cycles never accumulate rounding drift.
+        
+        Args:
+            running: Accumulator with 'n', 'sum', 'sum_sq' and 'histogram' keys
+            value: Sample value
+            sign: 1 to add the sample, -1 to remove it
+        """
+        running['n'] += sign
+        running['sum'] += sign * value
+        running['sum_sq'] += sign * value * value
+        
+        self._update_counter(running['histogram'], str(value), sign)
+    
+    def _update_counter(self, counter: Dict, key: str, sign: int) -> None:
+        """
+        Adjust a tally by sign, dropping keys whose count reaches zero.
+        
+        Args:
+            counter: Tally dictionary, modified in place
+            key: Key to adjust
+            sign: 1 to increment, -1 to decrement
+        """
+        new_count = counter.get(key, 0) + sign
+        if new_count > 0:
+            counter[key] = new_count
+        else:
+            counter.pop(key, None)
+    
     def compare_to_baseline(self, current_observation: Dict, baseline: Dict) -> Dict:
         """
         Compare current observation to baseline.
@@ -365,26 +763,15 @@ class BaselineModel:
         baseline_mean = bssid_baseline.get('mean', 0)
         baseline_std = bssid_baseline.get('std', 0)
         
-        # Compute z-score
-        if baseline_std > 0:
-            z_score = (current_bssid_count - baseline_mean) / baseline_std
-        else:
-            z_score = 0.0
-        
-        # Determine status
-        if abs(z_score) < 1.0:
-            status = 'NORMAL'
-            confidence = 0.90
-        elif abs(z_score) < 2.0:
-            status = 'SLIGHTLY_ELEVATED' if z_score > 0 else 'SLIGHTLY_REDUCED'
-            confidence = 0.75
-        else:
-            status = 'ANOMALOUS_HIGH' if z_score > 0 else 'ANOMALOUS_LOW'
-            confidence = 0.85
+        # Compute z-score (zero when the baseline has no spread)
+        z_score = (current_bssid_count - baseline_mean) * inverse_std(bssid_baseline)
+        
+        # Determine status by table lookup on the |z| band and direction
+        band = bisect_right(_ZSCORE_BANDS, abs(z_score))
         
         return {
-            'status': status,
-            'confidence': confidence,
+            'status': _BAND_STATUS[bool(z_score > 0)][band],
+            'confidence': _BAND_CONFIDENCE[band],
             'current_bssid_count': current_bssid_count,
             'baseline_mean': baseline_mean,
             'baseline_std': baseline_std,
@@ -15,10 +15,14 @@ This is for ENVIRONMENTAL ANALYSIS, not precise positioning or tracking.
 """
 
 import logging
+import math
+from bisect import bisect_right
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
 
+from .features import bssid_columns, std_with_mean
+
 
 class DistanceZone(Enum):
     """Distance zones for rough proximity classification."""
@@ -30,6 +34,27 @@ class DistanceZone(Enum):
     UNKNOWN = "UNKNOWN"            # Cannot estimate
 
 
+# Upper zone boundaries in meters; np.searchsorted(side='right') maps an
+# array of distances (bisect_right a single one) to indices in _ZONES_BY_INDEX.
+# UNKNOWN comes last so that zone indices also serve as np.bincount bins.
+_ZONE_BOUNDS_LIST = (2.0, 10.0, 30.0, 70.0)
+_ZONE_BOUNDS = np.array(_ZONE_BOUNDS_LIST)
+_ZONES_BY_INDEX = (
+    DistanceZone.VERY_CLOSE,
+    DistanceZone.CLOSE,
+    DistanceZone.MEDIUM,
+    DistanceZone.FAR,
+    DistanceZone.VERY_FAR,
+    DistanceZone.UNKNOWN
+)
+_UNKNOWN_ZONE_INDEX = len(_ZONES_BY_INDEX) - 1
+
+# Up to this many estimates, plain Python beats NumPy's per-call dispatch.
+# Below NumPy's 8-element pairwise summation block its sums run
+# sequentially, so both paths give identical statistics.
+_SMALL_STATS_MAX = 7
+
+
 class DistanceEstimator:
     """
     Estimates distance from Wi-Fi access points using RSSI.
@@ -65,7 +90,9 @@ class DistanceEstimator:
         self.show_distance_zones = distance_config.get('show_distance_zones', True)
         self.uncertainty_margin = distance_config.get('uncertainty_margin', 10)
         
-        self.logger.info(f"Distance estimation initialized (n={self.path_loss_exponent})")
+        self._build_lut()
+        
+        self.logger.info("Distance estimation initialized (n=%s)", self.path_loss_exponent)
         
         # Log important disclaimer
         self.logger.warning(
@@ -91,6 +118,36 @@ class DistanceEstimator:
         rssi_dbm = -100 + (rssi_percent * 0.7)
         return rssi_dbm
     
+    def _build_lut(self) -> None:
+        """
+        Precompute estimates and zones for every integer signal percentage.
+        
+        netsh reports whole percentages, so the path loss model only ever
+        sees 101 distinct inputs. Call again after changing the model
+        parameters on an existing estimator.
+        """
+        # Model constants folded once: with dBm = -100 + 0.7 * percent, the
+        # exponent (TxPower - dBm - C) / (10n) becomes (bias - 0.7 * percent) * inv_denom
+        denominator = 10 * self.path_loss_exponent
+        self._inv_denom = 1.0 / denominator if denominator != 0 else None
+        # Same exponent in base 2 for the array path: np.exp2 is several
+        # times faster than np.power(10.0, ...) on large arrays
+        self._exp2_scale = self._inv_denom * math.log2(10.0) if self._inv_denom is not None else None
+        self._bias = self.reference_tx_power + 100.0 - self.environmental_constant
+        
+        self._lut = [self._compute_distance(percent) for percent in range(101)]
+        self._zone_lut = [
+            _ZONES_BY_INDEX.index(self.classify_distance_zone(estimate[0]))
+            for estimate in self._lut
+        ]
+        self._zone_table = np.array(self._zone_lut, dtype=np.intp)
+        
+        # Columns (distance, lower, upper) for vectorized gathers
+        if self._lut[0][0] is None:
+            self._lut_table = None
+        else:
+            self._lut_table = np.array(self._lut, dtype=np.float64)
+    
     def estimate_distance(self, rssi_percent: int) -> Tuple[float, float, float]:
         """
         Estimate distance from RSSI percentage.
@@ -104,19 +161,28 @@ class DistanceEstimator:
         if not self.enabled or rssi_percent is None:
             return (None, None, None)
         
-        # Convert to dBm
-        rssi_dbm = self.rssi_percent_to_dbm(rssi_percent)
+        if type(rssi_percent) is int and 0 <= rssi_percent <= 100:
+            return self._lut[rssi_percent]
         
-        # Path Loss Model: RSSI = TxPower - 10*n*log10(d) - C
-        # Solving for d: d = 10^((TxPower - RSSI - C) / (10*n))
+        return self._compute_distance(rssi_percent)
+    
+    def _compute_distance(self, rssi_percent: float) -> Tuple[float, float, float]:
+        """
+        Evaluate the path loss model for one signal strength.
         
-        numerator = self.reference_tx_power - rssi_dbm - self.environmental_constant
-        denominator = 10 * self.path_loss_exponent
+        Args:
+            rssi_percent: Signal strength as percentage (0-100)
         
-        if denominator == 0:
+        Returns:
+            Tuple of (distance_meters, lower_bound, upper_bound)
+        """
+        # Path Loss Model: RSSI = TxPower - 10*n*log10(d) - C
+        # Solving for d: d = 10^((TxPower - RSSI - C) / (10*n)), with RSSI
+        # converted from percent as in rssi_percent_to_dbm()
+        if self._inv_denom is None:
             return (None, None, None)
         
-        distance = 10 ** (numerator / denominator)
+        distance = math.pow(10.0, (self._bias - 0.7 * rssi_percent) * self._inv_denom)
         
         # Calculate uncertainty bounds
         lower_bound = max(0, distance - self.uncertainty_margin)
@@ -137,16 +203,7 @@ class DistanceEstimator:
         if distance is None:
             return DistanceZone.UNKNOWN
         
-        if distance < 2:
-            return DistanceZone.VERY_CLOSE
-        elif distance < 10:
-            return DistanceZone.CLOSE
-        elif distance < 30:
-            return DistanceZone.MEDIUM
-        elif distance < 70:
-            return DistanceZone.FAR
-        else:
-            return DistanceZone.VERY_FAR
+        return _ZONES_BY_INDEX[bisect_right(_ZONE_BOUNDS_LIST, distance)]
     
     def analyze_observation(self, observation: Dict) -> Dict:
         """
@@ -171,47 +228,76 @@ class DistanceEstimator:
                 'distances': []
             }
         
-        distances = []
-        zone_counts = {zone: 0 for zone in DistanceZone}
-        
-        for bssid_info in bssids:
-            signal = bssid_info.get('signal')
-            
-            if signal is not None:
-                dist, lower, upper = self.estimate_distance(signal)
-                zone = self.classify_distance_zone(dist)
-                
-                zone_counts[zone] += 1
-                
-                distances.append({
-                    'ssid': bssid_info.get('ssid', ''),
-                    'bssid': bssid_info.get('bssid', ''),
-                    'signal_percent': signal,
-                    'estimated_distance_m': dist,
-                    'lower_bound_m': lower,
-                    'upper_bound_m': upper,
-                    'zone': zone.value,
-                    'channel': bssid_info.get('channel')
-                })
+        # Only BSSIDs reporting a signal get an estimate
+        columns = bssid_columns(observation)
+        measured = np.flatnonzero(columns.signal >= 0)
+        signals = columns.signal[measured]
+        
+        index = signals.astype(np.intp)
+        
+        if self._inv_denom is None:
+            # Same outcome as estimate_distance(): no estimate for any BSSID
+            valid_distances = np.empty(0)
+            estimates = [(None, None, None)] * len(measured)
+            zone_index = [_UNKNOWN_ZONE_INDEX] * len(measured)
+        elif len(measured) <= _SMALL_STATS_MAX and (not index.size or index.max() <= 100):
+            # A handful of whole percentages: plain lookups, no array temporaries
+            percents = index.tolist()
+            estimates = [self._lut[i] for i in percents]
+            valid_distances = [estimate[0] for estimate in estimates]
+            zone_index = [self._zone_lut[i] for i in percents]
+        elif index.max() <= 100:
+            # Whole percentages: gather precomputed estimates and zones
+            table = self._lut_table[index]
+            valid_distances = table[:, 0]
+            estimates = map(tuple, table.tolist())
+            zone_index = self._zone_table[index]
+        else:
+            # Vectorized estimate_distance() and classify_distance_zone()
+            valid_distances = np.exp2((self._bias - 0.7 * signals.astype(np.float64)) * self._exp2_scale)
+            lower = np.maximum(0.0, valid_distances - self.uncertainty_margin)
+            upper = valid_distances + self.uncertainty_margin
+            estimates = zip(valid_distances.tolist(), lower.tolist(), upper.tolist())
+            zone_index = np.searchsorted(_ZONE_BOUNDS, valid_distances, side='right')
+        
+        # Zone histogram indexed like _ZONES_BY_INDEX
+        if isinstance(zone_index, np.ndarray):
+            zone_counts = np.bincount(zone_index, minlength=len(_ZONES_BY_INDEX)).tolist()
+            zone_index = zone_index.tolist()
+        else:
+            zone_counts = [0] * len(_ZONES_BY_INDEX)
+            for i in zone_index:
+                zone_counts[i] += 1
+        zones = [_ZONES_BY_INDEX[i] for i in zone_index]
+        
+        distances = [
+            {
+                'ssid': ssid,
+                'bssid': bssid,
+                'signal_percent': signal,
+                'estimated_distance_m': dist,
+                'lower_bound_m': low,
+                'upper_bound_m': high,
+                'zone': zone.value,
+                'channel': channel if channel >= 0 else None
+            }
+            for ssid, bssid, signal, channel, (dist, low, high), zone in zip(
+                columns.ssid[measured].tolist(),
+                columns.bssid[measured].tolist(),
+                signals.tolist(),
+                columns.channel[measured].tolist(),
+                estimates,
+                zones
+            )
+        ]
         
         # Calculate statistics
-        valid_distances = [d['estimated_distance_m'] for d in distances if d['estimated_distance_m'] is not None]
-        
-        if valid_distances:
-            stats = {
-                'mean_distance': float(np.mean(valid_distances)),
-                'median_distance': float(np.median(valid_distances)),
-                'min_distance': float(np.min(valid_distances)),
-                'max_distance': float(np.max(valid_distances)),
-                'std_distance': float(np.std(valid_distances))
-            }
-        else:
-            stats = {}
+        stats = self._distance_statistics(valid_distances) if len(valid_distances) else {}
         
         # Zone distribution
         zone_distribution = {
             zone.value: count
-            for zone, count in zone_counts.items()
+            for zone, count in zip(_ZONES_BY_INDEX, zone_counts)
             if count > 0
         }
         
@@ -233,6 +319,46 @@ class DistanceEstimator:
             )
         }
     
+    def _distance_statistics(self, distances) -> Dict:
+        """
+        Summarize a non-empty sequence of distance estimates in few passes.
+        
+        Small inputs are summarized with scalar Python arithmetic. Otherwise
+        one np.partition yields the extremes and the median; the mean is
+        computed once and handed to np.std where NumPy supports it.
+        
+        Args:
+            distances: Distance estimates in meters (array or list)
+        
+        Returns:
+            Dictionary of distance statistics
+        """
+        n = len(distances)
+        if n <= _SMALL_STATS_MAX:
+            values = distances.tolist() if isinstance(distances, np.ndarray) else list(distances)
+            mean = sum(values) / n
+            ordered = sorted(values)
+            return {
+                'mean_distance': mean,
+                'median_distance': (ordered[(n - 1) // 2] + ordered[n // 2]) / 2,
+                'min_distance': ordered[0],
+                'max_distance': ordered[-1],
+                'std_distance': math.sqrt(sum((d - mean) * (d - mean) for d in values) / n)
+            }
+        
+        distances = np.asarray(distances, dtype=np.float64)
+        mid_low, mid_high = (n - 1) // 2, n // 2
+        partitioned = np.partition(distances, sorted({0, mid_low, mid_high, n - 1}))
+        mean = distances.sum() / n
+        
+        return {
+            'mean_distance': float(mean),
+            'median_distance': float((partitioned[mid_low] + partitioned[mid_high]) / 2),
+            'min_distance': float(partitioned[0]),
+            'max_distance': float(partitioned[n - 1]),
+            'std_distance': std_with_mean(distances, mean)
+        }
+    
     def get_zone_description(self, zone: DistanceZone) -> str:
         """
         Get human-readable description of distance zone.
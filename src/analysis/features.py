@@ -0,0 +1,124 @@
+"""
+Ambient Wi-Fi Monitor - Derived Features Module
+Per-observation features shared by several analyzers, computed once.
+"""
+
+import numpy as np
+from collections import Counter
+from typing import Dict, NamedTuple
+
+
+# Key under which derived features are attached to an observation. It is
+# in-memory only; storage and reporting drop it before serializing.
+DERIVED_KEY = '_derived'
+
+# np.std() takes a precomputed mean from NumPy 2.0 on
+_STD_ACCEPTS_MEAN = int(np.__version__.split('.')[0]) >= 2
+
+
+def std_with_mean(values: np.ndarray, mean: float) -> float:
+    """
+    Compute the population standard deviation reusing an already known mean.
+    
+    Args:
+        values: Non-empty array of values
+        mean: Mean of the values
+    
+    Returns:
+        Standard deviation; identical to values.std()
+    """
+    if _STD_ACCEPTS_MEAN:
+        return float(np.std(values, mean=mean))
+    return float(values.std())
+
+
+class BssidColumns(NamedTuple):
+    """
+    Column-wise (structure of arrays) view of an observation's BSSID list.
+    
+    Row i of every column describes the i-th BSSID. Signal is the reported
+    percentage stored as int8 (it never exceeds 100), channel is int16, and
+    both are -1 where the BSSID does not report them.
+    """
+    signal: np.ndarray
+    channel: np.ndarray
+    ssid: np.ndarray
+    bssid: np.ndarray
+
+
+def bssid_columns(observation: Dict) -> BssidColumns:
+    """
+    Get the BSSID list of an observation as columns, building them on first use.
+    
+    The columns are cached with the other derived features, so analyzers
+    that need per-BSSID fields read arrays instead of walking the list of
+    dictionaries. The dictionaries remain the stored representation.
+    
+    Args:
+        observation: Normalized observation dictionary
+    
+    Returns:
+        BssidColumns for the observation
+    """
+    derived = derive_features(observation)
+    columns = derived.get('columns')
+    if columns is not None:
+        return columns
+    
+    bssids = observation.get('wlan_networks', {}).get('bssids', [])
+    n = len(bssids)
+    
+    columns = BssidColumns(
+        signal=np.fromiter(
+            (-1 if b.get('signal') is None else b['signal'] for b in bssids),
+            dtype=np.int8, count=n
+        ),
+        channel=np.fromiter(
+            (-1 if b.get('channel') is None else b['channel'] for b in bssids),
+            dtype=np.int16, count=n
+        ),
+        ssid=np.array([b.get('ssid', '') for b in bssids], dtype=object),
+        bssid=np.array([b.get('bssid', '') for b in bssids], dtype=object)
+    )
+    derived['columns'] = columns
+    
+    return columns
+
+
+def derive_features(observation: Dict) -> Dict:
+    """
+    Get the derived features of an observation, computing them on first use.
+    
+    The features are attached to the observation dictionary so that every
+    analyzer looking at the same observation reuses them instead of walking
+    the BSSID list again. Observations kept in the in-memory history are
+    therefore parsed once, not on every scan they take part in.
+    
+    Args:
+        observation: Normalized observation dictionary
+    
+    Returns:
+        Dictionary with 'bssid_count' (from the summary), 'signals' (float64
+        array of the BSSIDs that report a signal) and 'channel_counts'
+        (channel -> number of BSSIDs, in order of first appearance)
+    """
+    derived = observation.get(DERIVED_KEY)
+    if derived is not None:
+        return derived
+    
+    networks = observation.get('wlan_networks', {})
+    
+    bssids = networks.get('bssids', [])
+    
+    derived = {
+        'bssid_count': networks.get('summary', {}).get('bssid_count', 0),
+        'signals': np.asarray(
+            [b['signal'] for b in bssids if b.get('signal') is not None],
+            dtype=np.float64
+        ),
+        'channel_counts': Counter(b['channel'] for b in bssids if b.get('channel') is not None)
+    }
+    observation[DERIVED_KEY] = derived
+    
+    return derived
+
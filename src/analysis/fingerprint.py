@@ -5,8 +5,12 @@ Creates reproducible fingerprints of Wi-Fi environments for comparison.
 
 import logging
 import hashlib
+import threading
 import numpy as np
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .features import derive_features, std_with_mean
 
 
 class EnvironmentalFingerprint:
@@ -31,6 +35,14 @@ class EnvironmentalFingerprint:
             'channel_diversity', 'signal_stability'
         ])
         self.similarity_threshold = fingerprint_config.get('similarity_threshold', 0.85)
+        
+        # Hash input order, sorted once instead of on every _compute_hash call
+        self._sorted_features = tuple(sorted(self.features))
+        
+        # Per-observation feature rows keyed by timestamp, sized to the history window
+        self._row_cache: 'OrderedDict[str, np.ndarray]' = OrderedDict()
+        self._row_cache_size = config.get('temporal', {}).get('long_term_window', 200)
+        self._row_cache_lock = threading.Lock()
     
     def generate(self, observation: Dict) -> Dict:
         """
@@ -46,41 +58,45 @@ class EnvironmentalFingerprint:
         
         networks = observation.get('wlan_networks', {})
         summary = networks.get('summary', {})
-        bssids = networks.get('bssids', [])
+        derived = derive_features(observation)
         
         # Extract features
         features = {}
         
         # BSSID count
         if 'bssid_count' in self.features:
-            features['bssid_count'] = summary.get('bssid_count', 0)
+            features['bssid_count'] = derived['bssid_count']
         
         # SSID count
         if 'ssid_count' in self.features:
             features['ssid_count'] = len(summary.get('ssids', []))
         
         # Signal statistics (using signal percentage)
-        signals = [b.get('signal') for b in bssids if b.get('signal') is not None]
-        if signals:
+        signals = derived['signals']
+        if signals.size:
+            # One mean, reused by the standard deviation and stability score
+            signal_mean = float(signals.sum()) / signals.size
+            signal_std = std_with_mean(signals, signal_mean)
+            
             if 'rssi_mean' in self.features:
-                features['rssi_mean'] = float(np.mean(signals))
+                features['rssi_mean'] = float(signal_mean)
             
             if 'rssi_std' in self.features:
-                features['rssi_std'] = float(np.std(signals))
+                features['rssi_std'] = float(signal_std)
             
             if 'signal_stability' in self.features:
                 # Lower std = more stable = higher score
-                if np.mean(signals) > 0:
-                    cv = np.std(signals) / np.mean(signals)
+                if signal_mean > 0:
+                    cv = signal_std / signal_mean
                     features['signal_stability'] = float(max(0, 1 - cv))
                 else:
                     features['signal_stability'] = 0.0
         
         # Channel diversity
         if 'channel_diversity' in self.features:
-            channels = [b.get('channel') for b in bssids if b.get('channel') is not None]
-            if channels:
-                unique_channels = len(set(channels))
+            channel_counts = derived['channel_counts']
+            if channel_counts:
+                unique_channels = len(channel_counts)
                 # Normalize by typical number of channels (assume max 14 for 2.4GHz + channels for 5GHz)
                 features['channel_diversity'] = float(unique_channels / 14.0)
             else:
@@ -96,6 +112,155 @@ class EnvironmentalFingerprint:
             'observation_count': 1
         }
     
+    def generate_batch(self, observations: Iterable[Dict]) -> Dict:
+        """
+        Generate an aggregated fingerprint directly from many observations.
+        
+        Equivalent to aggregating the per-observation output of generate(),
+        but walks each observation dict only once and derives every
+        per-observation feature with vectorized NumPy reductions. Feature
+        rows are cached by observation timestamp, so successive calls over a
+        sliding history window only compute rows for new observations.
+        
+        Args:
+            observations: Normalized observation dictionaries; any iterable
+                (e.g. an islice over the history) is consumed once
+        
+        Returns:
+            Aggregated fingerprint dictionary
+        """
+        rows, last_timestamp = self._feature_rows(observations)
+        if not len(rows):
+            return {}
+        
+        aggregated_features = self._median_features(rows)
+        
+        return {
+            'timestamp': last_timestamp,
+            'hash': self._compute_hash(aggregated_features),
+            'features': aggregated_features,
+            'observation_count': len(rows),
+            'aggregated': True
+        }
+    
+    def _feature_rows(self, observations: Iterable[Dict]) -> Tuple[np.ndarray, Optional[str]]:
+        """
+        Get per-observation feature rows, reusing cached rows where possible.
+        
+        Args:
+            observations: Normalized observation dictionaries
+        
+        Returns:
+            Tuple of an array of shape (observation count, len(self.features)),
+            NaN where an observation does not carry a feature, and the
+            timestamp of the last observation
+        """
+        cached = []
+        missing_index, missing_obs = [], []
+        timestamp = None
+        
+        with self._row_cache_lock:
+            for i, obs in enumerate(observations):
+                timestamp = obs.get('timestamp')
+                row = self._row_cache.get(timestamp)
+                cached.append(row)
+                if row is None:
+                    missing_index.append(i)
+                    missing_obs.append(obs)
+        
+        rows = np.empty((len(cached), len(self.features)))
+        for i, row in enumerate(cached):
+            if row is not None:
+                rows[i] = row
+        
+        if missing_obs:
+            computed = self._compute_feature_rows(missing_obs)
+            rows[missing_index] = computed
+            
+            with self._row_cache_lock:
+                for obs, row in zip(missing_obs, computed):
+                    obs_timestamp = obs.get('timestamp')
+                    if obs_timestamp is not None:
+                        self._row_cache[obs_timestamp] = row
+                while len(self._row_cache) > self._row_cache_size:
+                    self._row_cache.popitem(last=False)
+        
+        return rows, timestamp
+    
+    def _compute_feature_rows(self, observations: List[Dict]) -> np.ndarray:
+        """
+        Compute per-observation feature rows with vectorized reductions.
+        
+        Args:
+            observations: List of normalized observation dictionaries
+        
+        Returns:
+            Array of shape (len(observations), len(self.features))
+        """
+        n = len(observations)
+        
+        # Single pre-pass: flatten per-BSSID values with their owning observation
+        bssid_counts = np.empty(n, dtype=np.float64)
+        ssid_counts = np.empty(n, dtype=np.float64)
+        unique_channels = np.empty(n, dtype=np.float64)
+        signal_values, signal_owners = [], []
+        
+        for i, obs in enumerate(observations):
+            networks = obs.get('wlan_networks', {})
+            summary = networks.get('summary', {})
+            bssid_counts[i] = summary.get('bssid_count', 0)
+            ssid_counts[i] = len(summary.get('ssids', []))
+            
+            # Channel numbers are small ints, so a bitmask counts distinct ones
+            channel_mask = 0
+            for bssid in networks.get('bssids', []):
+                signal = bssid.get('signal')
+                if signal is not None:
+                    signal_values.append(signal)
+                    signal_owners.append(i)
+                channel = bssid.get('channel')
+                if channel is not None:
+                    channel_mask |= 1 << channel
+            unique_channels[i] = bin(channel_mask).count('1')
+        
+        columns = {
+            'bssid_count': bssid_counts,
+            'ssid_count': ssid_counts
+        }
+        
+        # Per-observation signal statistics (NaN where an observation has no signals)
+        owners = np.asarray(signal_owners, dtype=np.intp)
+        values = np.asarray(signal_values, dtype=np.float64)
+        signal_n = np.bincount(owners, minlength=n)
+        has_signals = signal_n > 0
+        
+        rssi_mean = np.full(n, np.nan)
+        rssi_mean[has_signals] = (
+            np.bincount(owners, weights=values, minlength=n)[has_signals] / signal_n[has_signals]
+        )
+        centered = values - rssi_mean[owners]
+        rssi_std = np.full(n, np.nan)
+        rssi_std[has_signals] = np.sqrt(
+            np.bincount(owners, weights=centered * centered, minlength=n)[has_signals]
+            / signal_n[has_signals]
+        )
+        
+        # Lower std = more stable = higher score
+        stability = np.full(n, np.nan)
+        positive = has_signals & (rssi_mean > 0)
+        stability[has_signals] = 0.0
+        stability[positive] = np.maximum(0.0, 1.0 - rssi_std[positive] / rssi_mean[positive])
+        
+        columns['rssi_mean'] = rssi_mean
+        columns['rssi_std'] = rssi_std
+        columns['signal_stability'] = stability
+        
+        columns['channel_diversity'] = unique_channels / 14.0
+        
+        # One column per configured feature; unknown features are never present
+        missing_column = np.full(n, np.nan)
+        return np.column_stack([columns.get(feature, missing_column) for feature in self.features])
+    
     def _compute_hash(self, features: Dict) -> str:
         """
         Compute a hash from feature values.
@@ -106,20 +271,24 @@ class EnvironmentalFingerprint:
         Returns:
             8-character hex hash
         """
-        # Round features to avoid minor variations
-        rounded = {}
-        for key, value in features.items():
-            if isinstance(value, float):
-                rounded[key] = round(value, 1)
-            else:
-                rounded[key] = value
+        # Deterministic key order; features are normally a subset of the configured ones
+        keys = [key for key in self._sorted_features if key in features]
+        if len(keys) != len(features):
+            keys = sorted(features)
         
-        # Create deterministic string
-        feature_str = "|".join(f"{k}:{v}" for k, v in sorted(rounded.items()))
+        # Create deterministic string, rounding floats to avoid minor variations.
+        # The text form (not raw array bytes) keeps hashes in saved reports
+        # comparable and ties each value to its feature name.
+        parts = []
+        for key in keys:
+            value = features[key]
+            if isinstance(value, float):
+                value = round(value, 1)
+            parts.append(f"{key}:{value}")
+        feature_str = "|".join(parts)
         
-        # Hash
-        hash_obj = hashlib.sha256(feature_str.encode())
-        return hash_obj.hexdigest()[:8]
+        # Hash; BLAKE2b emits the 4-byte digest directly
+        return hashlib.blake2b(feature_str.encode(), digest_size=4).hexdigest()
     
     def compare(self, fingerprint1: Dict, fingerprint2: Dict) -> Dict:
         """
@@ -135,29 +304,27 @@ class EnvironmentalFingerprint:
         features1 = fingerprint1.get('features', {})
         features2 = fingerprint2.get('features', {})
         
-        # Compute similarity for each feature
-        feature_similarities = {}
-        for feature in self.features:
-            if feature in features1 and feature in features2:
-                val1 = features1[feature]
-                val2 = features2[feature]
-                
-                # Compute normalized difference
-                if val1 == 0 and val2 == 0:
-                    similarity = 1.0
-                elif val1 == 0 or val2 == 0:
-                    similarity = 0.0
-                else:
-                    max_val = max(abs(val1), abs(val2))
-                    diff = abs(val1 - val2)
-                    similarity = max(0.0, 1.0 - (diff / max_val))
-                
-                feature_similarities[feature] = similarity
-        
-        # Overall similarity (average of feature similarities)
-        if feature_similarities:
-            overall_similarity = np.mean(list(feature_similarities.values()))
+        # Compute similarity for each feature both fingerprints carry
+        common = [feature for feature in self.features if feature in features1 and feature in features2]
+        
+        if common:
+            val1 = np.fromiter((features1[f] for f in common), dtype=np.float64, count=len(common))
+            val2 = np.fromiter((features2[f] for f in common), dtype=np.float64, count=len(common))
+            
+            # Normalized difference; 1.0 if both are zero, 0.0 if only one is
+            zero1 = val1 == 0
+            zero2 = val2 == 0
+            max_val = np.maximum(np.abs(val1), np.abs(val2))
+            similarity = np.maximum(0.0, 1.0 - np.abs(val1 - val2) / np.where(max_val == 0, 1.0, max_val))
+            similarity[zero1 | zero2] = 0.0
+            similarity[zero1 & zero2] = 1.0
+            
+            feature_similarities = dict(zip(common, similarity.tolist()))
+            
+            # Overall similarity (average of feature similarities)
+            overall_similarity = similarity.mean()
         else:
+            feature_similarities = {}
             overall_similarity = 0.0
         
         # Match status
@@ -184,20 +351,15 @@ class EnvironmentalFingerprint:
         if not fingerprints:
             return {}
         
-        # Collect all features
-        all_features = {feature: [] for feature in self.features}
-        
-        for fp in fingerprints:
+        # Collect all features into one matrix, NaN where a fingerprint lacks one
+        matrix = np.full((len(fingerprints), len(self.features)), np.nan)
+        for i, fp in enumerate(fingerprints):
             features = fp.get('features', {})
-            for feature in self.features:
+            for j, feature in enumerate(self.features):
                 if feature in features:
-                    all_features[feature].append(features[feature])
+                    matrix[i, j] = features[feature]
         
-        # Compute median for each feature
-        aggregated_features = {}
-        for feature, values in all_features.items():
-            if values:
-                aggregated_features[feature] = float(np.median(values))
+        aggregated_features = self._median_features(matrix)
         
         # Generate hash
         fingerprint_hash = self._compute_hash(aggregated_features)
@@ -210,6 +372,34 @@ class EnvironmentalFingerprint:
             'aggregated': True
         }
     
+    def _median_features(self, matrix: np.ndarray) -> Dict:
+        """
+        Take the per-feature median of a feature matrix in one call.
+        
+        Args:
+            matrix: Array of shape (count, len(self.features)), NaN where a
+                row does not carry a feature
+        
+        Returns:
+            Feature dictionary of medians, omitting features no row carries
+        """
+        # Median for each feature carried by at least one row
+        missing = np.isnan(matrix)
+        present = ~missing.all(axis=0)
+        if missing.any():
+            medians = np.nanmedian(matrix[:, present], axis=0)
+        else:
+            # Usual case: np.median selects with np.partition, while
+            # nanmedian on small inputs goes through a masked-array sort
+            medians = np.median(matrix, axis=0)
+        return {
+            feature: float(median)
+            for feature, median in zip(
+                (feature for feature, keep in zip(self.features, present) if keep),
+                medians.tolist()
+            )
+        }
+    
     def _interpret_comparison(self, similarity: float, is_match: bool) -> str:
         """
         Generate human-readable interpretation of fingerprint comparison.
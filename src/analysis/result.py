@@ -0,0 +1,25 @@
+"""
+Ambient Wi-Fi Monitor - Analysis Result Module
+Container for the complete analysis of one observation.
+"""
+
+from typing import Dict, NamedTuple, Optional
+
+
+class AnalysisResult(NamedTuple):
+    """
+    Complete analysis of one observation, as consumed by the reporters.
+    
+    Report-only fields are None when the analysis ran without reporting.
+    Use _asdict() where a plain dictionary is needed.
+    """
+    metadata: Dict
+    current_observation: Dict
+    baseline_info: Optional[Dict]
+    baseline_comparison: Dict
+    temporal_analysis: Optional[Dict]
+    anomaly_detection: Dict
+    fingerprint: Optional[Dict]
+    baseline_fingerprint: Optional[Dict]
+    fingerprint_comparison: Optional[Dict]
+    distance_analysis: Optional[Dict]
@@ -4,10 +4,97 @@ Analyzes changes and trends over time windows.
 """
 
 import logging
-import numpy as np
-from typing import Dict, List, Optional
+import math
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional
 from datetime import datetime
 
+from .features import derive_features
+
+
+class _RollingWindow:
+    """
+    Bounded window of BSSID counts with O(1) amortized summary statistics.
+    
+    Counts are pushed oldest to newest. Sums are kept as exact integers,
+    min/max come from monotonic deques, and the age-weighted sum (age 0 is
+    the newest count) feeds the closed-form trend slope.
+    """
+    
+    __slots__ = ('size', 'values', 'total', 'total_sq', 'weighted', 'seq', '_mins', '_maxs')
+    
+    def __init__(self, size: int):
+        self.size = size
+        self.values = deque()
+        self.total = 0
+        self.total_sq = 0
+        self.weighted = 0
+        self.seq = 0
+        self._mins = deque()
+        self._maxs = deque()
+    
+    def __len__(self) -> int:
+        return len(self.values)
+    
+    def push(self, value: int):
+        """Append the newest count, expiring the oldest one past the window size."""
+        # Every count already held ages by one step
+        self.weighted += self.total
+        self.values.append(value)
+        self.total += value
+        self.total_sq += value * value
+        
+        mins = self._mins
+        while mins and mins[-1][1] >= value:
+            mins.pop()
+        mins.append((self.seq, value))
+        maxs = self._maxs
+        while maxs and maxs[-1][1] <= value:
+            maxs.pop()
+        maxs.append((self.seq, value))
+        self.seq += 1
+        
+        self.trim(self.size)
+    
+    def trim(self, limit: int):
+        """Drop the oldest counts until at most ``limit`` remain."""
+        values = self.values
+        while len(values) > limit:
+            value = values.popleft()
+            expired_seq = self.seq - len(values) - 1
+            self.total -= value
+            self.total_sq -= value * value
+            # Its age equals the number of counts left after removal
+            self.weighted -= value * len(values)
+            if self._mins[0][0] == expired_seq:
+                self._mins.popleft()
+            if self._maxs[0][0] == expired_seq:
+                self._maxs.popleft()
+    
+    def mean(self) -> float:
+        return self.total / len(self.values)
+    
+    def std(self) -> float:
+        n = len(self.values)
+        return math.sqrt(max(n * self.total_sq - self.total * self.total, 0)) / n
+    
+    def min(self) -> int:
+        return self._mins[0][1]
+    
+    def max(self) -> int:
+        return self._maxs[0][1]
+    
+    def slope(self) -> float:
+        """Least-squares slope of the counts against their age."""
+        # x = 0..n-1 has mean (n-1)/2 and sum of squared deviations n(n^2-1)/12
+        n = len(self.values)
+        if n < 2:
+            return 0.0
+        return (self.weighted - (n - 1) / 2.0 * self.total) / (n * (n * n - 1) / 12.0)
+    
+    def newest_first(self) -> Iterator[int]:
+        return reversed(self.values)
+
 
 class TemporalAnalyzer:
     """
@@ -31,6 +118,12 @@ class TemporalAnalyzer:
         self.long_term_window = temporal_config.get('long_term_window', 200)
         self.smoothing_factor = temporal_config.get('smoothing_factor', 0.3)
         self.min_change_threshold = temporal_config.get('min_change_threshold', 15.0)
+        
+        # Rolling windows carried across calls; history only gains one
+        # observation per scan, so each call is an O(1) amortized update
+        self._windows: Optional[Dict[str, _RollingWindow]] = None
+        self._newest: Optional[Dict] = None
+        self._history_size = 0
     
     def analyze(self, current_observation: Dict, historical_observations: List[Dict]) -> Dict:
         """
@@ -43,35 +136,37 @@ class TemporalAnalyzer:
         Returns:
             Temporal analysis results dictionary
         """
-        self.logger.info(f"Performing temporal analysis with {len(historical_observations)} historical observations")
+        self.logger.info("Performing temporal analysis with %d historical observations", len(historical_observations))
         
         # Extract BSSID count from current observation
         current_count = self._get_bssid_count(current_observation)
         
+        windows = self._sync_windows(historical_observations)
+        
         # Analyze different time windows
         short_term = self._analyze_window(
             current_count,
-            historical_observations[:self.short_term_window],
+            windows['short_term'],
             'short_term'
         )
         
         medium_term = self._analyze_window(
             current_count,
-            historical_observations[:self.medium_term_window],
+            windows['medium_term'],
             'medium_term'
         )
         
         long_term = self._analyze_window(
             current_count,
-            historical_observations[:self.long_term_window],
+            windows['long_term'],
             'long_term'
         )
         
         # Detect trends
-        trend = self._detect_trend(historical_observations)
+        trend = self._detect_trend(windows['medium_term'], len(historical_observations))
         
         # Compute smoothed values
-        smoothed = self._compute_smoothed_value(current_count, historical_observations)
+        smoothed = self._compute_smoothed_value(current_count, windows['short_term'].newest_first())
         
         return {
             'timestamp': current_observation.get('timestamp'),
@@ -96,32 +191,81 @@ class TemporalAnalyzer:
         Returns:
             BSSID count
         """
-        networks = observation.get('wlan_networks', {})
-        summary = networks.get('summary', {})
-        return summary.get('bssid_count', 0)
+        # Read from the derived features cached on the observation rather
+        # than walking wlan_networks -> summary on every access
+        return derive_features(observation)['bssid_count']
     
-    def _analyze_window(self, current_count: int, window_observations: List[Dict], window_name: str) -> Dict:
+    def _sync_windows(self, historical_observations: List[Dict]) -> Dict[str, _RollingWindow]:
+        """
+        Bring the rolling windows in line with the historical observations.
+        
+        When the history only gained a new newest observation since the last
+        call, its count is pushed; any other change rebuilds the windows.
+        
+        Args:
+            historical_observations: List of historical observations (newest first)
+        
+        Returns:
+            Rolling windows keyed by window name
+        """
+        history_size = len(historical_observations)
+        newest = historical_observations[0] if historical_observations else None
+        windows = self._windows
+        
+        if windows is not None and newest is not None and self._newest is not None:
+            if newest is self._newest and history_size <= self._history_size:
+                pass
+            elif (history_size > 1 and historical_observations[1] is self._newest
+                    and history_size <= self._history_size + 1):
+                count = self._get_bssid_count(newest)
+                for window in windows.values():
+                    window.push(count)
+            else:
+                windows = None
+        else:
+            windows = None
+        
+        if windows is None:
+            windows = {
+                'short_term': _RollingWindow(self.short_term_window),
+                'medium_term': _RollingWindow(self.medium_term_window),
+                'long_term': _RollingWindow(self.long_term_window)
+            }
+            widest = max(self.short_term_window, self.medium_term_window, self.long_term_window)
+            for obs in reversed(historical_observations[:widest]):
+                count = self._get_bssid_count(obs)
+                for window in windows.values():
+                    window.push(count)
+        
+        # A history shorter than before (or than a window) caps every window
+        for window in windows.values():
+            window.trim(history_size)
+        
+        self._windows = windows
+        self._newest = newest
+        self._history_size = history_size
+        return windows
+    
+    def _analyze_window(self, current_count: int, window: _RollingWindow, window_name: str) -> Dict:
         """
         Analyze a specific time window.
         
         Args:
             current_count: Current BSSID count
-            window_observations: Observations in this window
+            window: Rolling window holding the BSSID counts of this window
             window_name: Name of the window
         
         Returns:
             Window analysis results
         """
-        if not window_observations:
+        if not len(window):
             return {
                 'available': False,
                 'window_size': 0
             }
         
-        counts = [self._get_bssid_count(obs) for obs in window_observations]
-        
-        window_mean = np.mean(counts)
-        window_std = np.std(counts)
+        window_mean = window.mean()
+        window_std = window.std()
         
         # Compute change percentage
         if window_mean > 0:
@@ -139,44 +283,33 @@ class TemporalAnalyzer:
         
         return {
             'available': True,
-            'window_size': len(counts),
+            'window_size': len(window),
             'mean': float(window_mean),
             'std': float(window_std),
-            'min': int(np.min(counts)),
-            'max': int(np.max(counts)),
+            'min': int(window.min()),
+            'max': int(window.max()),
             'change_percent': float(change_percent),
             'status': status
         }
     
-    def _detect_trend(self, observations: List[Dict]) -> Dict:
+    def _detect_trend(self, window: _RollingWindow, history_size: int) -> Dict:
         """
         Detect overall trend using linear regression.
         
         Args:
-            observations: List of historical observations
+            window: Rolling window of the medium-term BSSID counts
+            history_size: Total number of historical observations
         
         Returns:
             Trend analysis results
         """
-        if len(observations) < 10:
+        if history_size < 10:
             return {
                 'available': False,
                 'reason': 'insufficient_data'
             }
         
-        # Extract counts
-        counts = [self._get_bssid_count(obs) for obs in observations[:self.medium_term_window]]
-        
-        # Simple linear regression
-        x = np.arange(len(counts))
-        y = np.array(counts)
-        
-        # Compute slope
-        if len(x) > 1:
-            slope, intercept = np.polyfit(x, y, 1)
-        else:
-            slope = 0.0
-            intercept = 0.0
+        slope = window.slope()
         
         # Classify trend
         if abs(slope) < 0.1:
@@ -197,29 +330,24 @@ class TemporalAnalyzer:
             'confidence': 0.75
         }
     
-    def _compute_smoothed_value(self, current_count: int, historical_observations: List[Dict]) -> float:
+    def _compute_smoothed_value(self, current_count: int, recent_counts: Iterable[int]) -> float:
         """
         Compute exponentially weighted moving average.
         
         Args:
             current_count: Current BSSID count
-            historical_observations: List of historical observations
+            recent_counts: BSSID counts of the short-term window (newest first)
         
         Returns:
             Smoothed value
         """
-        if not historical_observations:
-            return float(current_count)
-        
-        recent_counts = [
-            self._get_bssid_count(obs)
-            for obs in historical_observations[:self.short_term_window]
-        ]
-        
-        # EWMA
+        # EWMA over plain floats; the window is short, so a scalar loop with
+        # the coefficients hoisted beats any array formulation
+        alpha = self.smoothing_factor
+        decay = 1 - alpha
         smoothed = current_count
         for count in recent_counts:
-            smoothed = self.smoothing_factor * count + (1 - self.smoothing_factor) * smoothed
+            smoothed = alpha * count + decay * smoothed
         
         return float(smoothed)
     
@@ -5,13 +5,79 @@ Responsible for executing OS-level commands to gather Wi-Fi environmental data.
 
 import subprocess
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from typing import Callable, Dict, Optional, Sequence, Tuple, Union
+
+
+# Seconds a successful command result is reused before the command runs again,
+# per collector data type. The visible network list only changes when the
+# driver rescans, and the ARP table changes slowly; interface state is always
+# read fresh.
+DEFAULT_CACHE_TTL = {
+    'wlan_interface': 0,
+    'wlan_networks': 15,
+    'ipconfig': 0,
+    'arp': 15
+}
+
+# Timeout in seconds per collector data type. Only the network scan is slow;
+# the other commands return well within a second, so a hung one is given up
+# on early instead of holding the collection for the full command_timeout.
+DEFAULT_COMMAND_TIMEOUTS = {
+    'wlan_interface': 3,
+    'wlan_networks': 15,
+    'ipconfig': 5,
+    'arp': 3
+}
+
+# Keeps Windows from flashing a console window per command; 0 elsewhere
+_CREATION_FLAGS = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+
+# Byte order marks some netsh locales prefix their output with
+_UTF16_BOMS = (b'\xff\xfe', b'\xfe\xff')
+
+
+def _decode_output(data: bytes) -> str:
+    """
+    Decode captured command output to text in one pass.
+    
+    Output is UTF-8 unless it starts with a UTF-16 byte order mark. Line
+    endings are normalized to '\n' as text-mode capture would.
+    
+    Args:
+        data: Raw stdout or stderr bytes
+    
+    Returns:
+        Decoded text
+    """
+    if not data:
+        return ''
+    encoding = 'utf-16' if data.startswith(_UTF16_BOMS) else 'utf-8-sig'
+    text = data.decode(encoding, errors='replace')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def _command_text(command: Union[str, Sequence[str]]) -> str:
+    """Render a command string or argument tuple for log messages."""
+    return command if isinstance(command, str) else ' '.join(command)
+
+
+# Seconds a passed compliance check is trusted before it is repeated
+_COMPLIANCE_RECHECK_S = 300
 
 
 class CommandExecutor:
     """
     Executes Windows system commands with timeout and error handling.
+    
+    Every command runs in its own short-lived process. A persistent shell
+    worker would serialize the concurrent collectors behind one pipe, and
+    its output encoding would alter the raw text that is stored verbatim.
+    At the scan interval, process start-up cost is negligible.
     """
     
     def __init__(self, timeout: int = 30):
@@ -23,45 +89,88 @@ class CommandExecutor:
         """
         self.timeout = timeout
         self.logger = logging.getLogger('ambient_wifi_monitor.collectors')
+        
+        # command -> (monotonic time of the run, ISO timestamp of the run,
+        # result) for successful runs
+        self._cache: Dict[str, Tuple[float, str, Tuple[bool, str, str]]] = {}
     
-    def execute(self, command: str) -> Tuple[bool, str, str]:
+    def execute(self, command: Union[str, Sequence[str]], cache_ttl: float = 0,
+                force_refresh: bool = False, timeout: Optional[float] = None,
+                timestamp: Optional[str] = None) -> Tuple[bool, str, str, Optional[str]]:
         """
         Execute a system command and capture output.
         
         Args:
-            command: Command string to execute
+            command: Argument tuple to execute directly, or a command string
+                run through the shell
+            cache_ttl: Seconds a previous successful result of the same
+                command may be reused instead of running it again
+            force_refresh: Run the command even if a cached result is fresh
+            timeout: Timeout in seconds for this command; defaults to the
+                executor timeout
+            timestamp: ISO timestamp the caller records for this run, kept
+                with a cached result; defaults to the current time
+        
+        Returns:
+            Tuple of (success: bool, stdout: str, stderr: str,
+            cached_timestamp: ISO timestamp of the run whose output was
+            reused, or None if the command was run)
+        """
+        if cache_ttl > 0 and not force_refresh:
+            cached = self._cache.get(command)
+            if cached is not None and time.monotonic() - cached[0] < cache_ttl:
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug("Reusing cached output: %s", _command_text(command))
+                return cached[2] + (cached[1],)
+        
+        result = self._run(command, self.timeout if timeout is None else timeout)
+        
+        if result[0]:
+            self._cache[command] = (time.monotonic(), timestamp or datetime.now().isoformat(), result)
+        
+        return result + (None,)
+    
+    def _run(self, command: Union[str, Sequence[str]], timeout: float) -> Tuple[bool, str, str]:
+        """
+        Run a system command and capture output.
+        
+        Args:
+            command: Argument tuple to execute directly, or a command string
+                run through the shell
+            timeout: Timeout in seconds
         
         Returns:
             Tuple of (success: bool, stdout: str, stderr: str)
         """
-        self.logger.debug(f"Executing command: {command}")
+        # Argument tuples skip the extra cmd.exe process a shell command costs
+        shell = isinstance(command, str)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Executing command: %s", _command_text(command))
         
         try:
             result = subprocess.run(
                 command,
-                shell=True,
+                shell=shell,
                 capture_output=True,
-                text=True,
-                timeout=self.timeout,
-                encoding='utf-8',
-                errors='replace'
+                timeout=timeout,
+                creationflags=_CREATION_FLAGS
             )
             
             success = result.returncode == 0
             
             if not success:
                 self.logger.warning(
-                    f"Command failed with return code {result.returncode}: {command}"
+                    "Command failed with return code %d: %s", result.returncode, _command_text(command)
                 )
             
-            return success, result.stdout, result.stderr
+            return success, _decode_output(result.stdout), _decode_output(result.stderr)
             
         except subprocess.TimeoutExpired:
-            self.logger.error(f"Command timeout after {self.timeout}s: {command}")
-            return False, "", f"Command timeout after {self.timeout} seconds"
+            self.logger.error("Command timeout after %ss: %s", timeout, _command_text(command))
+            return False, "", f"Command timeout after {timeout} seconds"
         
         except Exception as e:
-            self.logger.error(f"Command execution error: {e}")
+            self.logger.error("Command execution error: %s", e)
             return False, "", str(e)
 
 
@@ -70,31 +179,47 @@ class WlanInterfaceCollector:
     Collects data from 'netsh wlan show interfaces' command.
     """
     
-    def __init__(self, executor: CommandExecutor):
+    COMMAND = ('netsh', 'wlan', 'show', 'interfaces')
+    
+    def __init__(self, executor: CommandExecutor, cache_ttl: float = 0,
+                 timeout: Optional[float] = None):
         """
         Initialize WLAN interface collector.
         
         Args:
             executor: CommandExecutor instance
+            cache_ttl: Seconds a previous successful output may be reused
+            timeout: Command timeout in seconds; defaults to the executor timeout
         """
         self.executor = executor
+        self.cache_ttl = cache_ttl
+        self.timeout = timeout
         self.logger = logging.getLogger('ambient_wifi_monitor.collectors.interface')
     
-    def collect(self) -> Dict:
+    def collect(self, force_refresh: bool = False, timestamp: Optional[str] = None) -> Dict:
         """
         Collect current WLAN interface information.
         
+        Args:
+            force_refresh: Run the command even if a cached output is fresh
+            timestamp: ISO timestamp to record; defaults to the current time
+        
         Returns:
             Dictionary containing collection results
         """
         self.logger.info("Collecting WLAN interface data")
         
-        success, stdout, stderr = self.executor.execute("netsh wlan show interfaces")
+        timestamp = timestamp or datetime.now().isoformat()
+        success, stdout, stderr, cached_timestamp = self.executor.execute(
+            self.COMMAND, self.cache_ttl, force_refresh, self.timeout, timestamp
+        )
         
+        # Reused output keeps the time it was actually collected
         return {
-            'timestamp': datetime.now().isoformat(),
-            'command': 'netsh wlan show interfaces',
+            'timestamp': cached_timestamp or timestamp,
+            'command': ' '.join(self.COMMAND),
             'success': success,
+            'cached': cached_timestamp is not None,
             'stdout': stdout,
             'stderr': stderr,
             'data_type': 'wlan_interface'
@@ -106,31 +231,47 @@ class WlanNetworksCollector:
     Collects data from 'netsh wlan show networks mode=bssid' command.
     """
     
-    def __init__(self, executor: CommandExecutor):
+    COMMAND = ('netsh', 'wlan', 'show', 'networks', 'mode=bssid')
+    
+    def __init__(self, executor: CommandExecutor, cache_ttl: float = 0,
+                 timeout: Optional[float] = None):
         """
         Initialize WLAN networks collector.
         
         Args:
             executor: CommandExecutor instance
+            cache_ttl: Seconds a previous successful output may be reused
+            timeout: Command timeout in seconds; defaults to the executor timeout
         """
         self.executor = executor
+        self.cache_ttl = cache_ttl
+        self.timeout = timeout
         self.logger = logging.getLogger('ambient_wifi_monitor.collectors.networks')
     
-    def collect(self) -> Dict:
+    def collect(self, force_refresh: bool = False, timestamp: Optional[str] = None) -> Dict:
         """
         Collect visible WLAN networks with BSSID information.
         
+        Args:
+            force_refresh: Run the command even if a cached output is fresh
+            timestamp: ISO timestamp to record; defaults to the current time
+        
         Returns:
             Dictionary containing collection results
         """
         self.logger.info("Collecting WLAN networks data")
         
-        success, stdout, stderr = self.executor.execute("netsh wlan show networks mode=bssid")
+        timestamp = timestamp or datetime.now().isoformat()
+        success, stdout, stderr, cached_timestamp = self.executor.execute(
+            self.COMMAND, self.cache_ttl, force_refresh, self.timeout, timestamp
+        )
         
+        # Reused output keeps the time it was actually collected
         return {
-            'timestamp': datetime.now().isoformat(),
-            'command': 'netsh wlan show networks mode=bssid',
+            'timestamp': cached_timestamp or timestamp,
+            'command': ' '.join(self.COMMAND),
             'success': success,
+            'cached': cached_timestamp is not None,
             'stdout': stdout,
             'stderr': stderr,
             'data_type': 'wlan_networks'
@@ -142,31 +283,47 @@ class IpConfigCollector:
     Collects data from 'ipconfig /all' command.
     """
     
-    def __init__(self, executor: CommandExecutor):
+    COMMAND = ('ipconfig', '/all')
+    
+    def __init__(self, executor: CommandExecutor, cache_ttl: float = 0,
+                 timeout: Optional[float] = None):
         """
         Initialize ipconfig collector.
         
         Args:
             executor: CommandExecutor instance
+            cache_ttl: Seconds a previous successful output may be reused
+            timeout: Command timeout in seconds; defaults to the executor timeout
         """
         self.executor = executor
+        self.cache_ttl = cache_ttl
+        self.timeout = timeout
         self.logger = logging.getLogger('ambient_wifi_monitor.collectors.ipconfig')
     
-    def collect(self) -> Dict:
+    def collect(self, force_refresh: bool = False, timestamp: Optional[str] = None) -> Dict:
         """
         Collect network configuration information.
         
+        Args:
+            force_refresh: Run the command even if a cached output is fresh
+            timestamp: ISO timestamp to record; defaults to the current time
+        
         Returns:
             Dictionary containing collection results
         """
         self.logger.info("Collecting ipconfig data")
         
-        success, stdout, stderr = self.executor.execute("ipconfig /all")
+        timestamp = timestamp or datetime.now().isoformat()
+        success, stdout, stderr, cached_timestamp = self.executor.execute(
+            self.COMMAND, self.cache_ttl, force_refresh, self.timeout, timestamp
+        )
         
+        # Reused output keeps the time it was actually collected
         return {
-            'timestamp': datetime.now().isoformat(),
-            'command': 'ipconfig /all',
+            'timestamp': cached_timestamp or timestamp,
+            'command': ' '.join(self.COMMAND),
             'success': success,
+            'cached': cached_timestamp is not None,
             'stdout': stdout,
             'stderr': stderr,
             'data_type': 'ipconfig'
@@ -178,31 +335,47 @@ class ArpCollector:
     Collects data from 'arp -a' command.
     """
     
-    def __init__(self, executor: CommandExecutor):
+    COMMAND = ('arp', '-a')
+    
+    def __init__(self, executor: CommandExecutor, cache_ttl: float = 0,
+                 timeout: Optional[float] = None):
         """
         Initialize ARP collector.
         
         Args:
             executor: CommandExecutor instance
+            cache_ttl: Seconds a previous successful output may be reused
+            timeout: Command timeout in seconds; defaults to the executor timeout
         """
         self.executor = executor
+        self.cache_ttl = cache_ttl
+        self.timeout = timeout
         self.logger = logging.getLogger('ambient_wifi_monitor.collectors.arp')
     
-    def collect(self) -> Dict:
+    def collect(self, force_refresh: bool = False, timestamp: Optional[str] = None) -> Dict:
         """
         Collect ARP table information.
         
+        Args:
+            force_refresh: Run the command even if a cached output is fresh
+            timestamp: ISO timestamp to record; defaults to the current time
+        
         Returns:
             Dictionary containing collection results
         """
         self.logger.info("Collecting ARP table data")
         
-        success, stdout, stderr = self.executor.execute("arp -a")
+        timestamp = timestamp or datetime.now().isoformat()
+        success, stdout, stderr, cached_timestamp = self.executor.execute(
+            self.COMMAND, self.cache_ttl, force_refresh, self.timeout, timestamp
+        )
         
+        # Reused output keeps the time it was actually collected
         return {
-            'timestamp': datetime.now().isoformat(),
-            'command': 'arp -a',
+            'timestamp': cached_timestamp or timestamp,
+            'command': ' '.join(self.COMMAND),
             'success': success,
+            'cached': cached_timestamp is not None,
             'stdout': stdout,
             'stderr': stderr,
             'data_type': 'arp'
@@ -227,36 +400,157 @@ class DataCollectionOrchestrator:
         self.logger = logging.getLogger('ambient_wifi_monitor.collectors')
         
         # Initialize command executor
-        timeout = config.get('collection', {}).get('command_timeout', 30)
+        collection_config = config.get('collection', {})
+        timeout = collection_config.get('command_timeout', 30)
         self.executor = CommandExecutor(timeout=timeout)
         
+        # Output reuse window per collector
+        cache_ttl = dict(DEFAULT_CACHE_TTL)
+        cache_ttl.update(collection_config.get('cache_ttl') or {})
+        
+        # Timeout per collector; command_timeout stays the upper bound
+        timeouts = {name: min(value, timeout) for name, value in DEFAULT_COMMAND_TIMEOUTS.items()}
+        timeouts.update(collection_config.get('command_timeouts') or {})
+        
         # Initialize individual collectors
-        self.interface_collector = WlanInterfaceCollector(self.executor)
-        self.networks_collector = WlanNetworksCollector(self.executor)
-        self.ipconfig_collector = IpConfigCollector(self.executor)
-        self.arp_collector = ArpCollector(self.executor)
+        self.interface_collector = WlanInterfaceCollector(
+            self.executor, cache_ttl['wlan_interface'], timeouts['wlan_interface']
+        )
+        self.networks_collector = WlanNetworksCollector(
+            self.executor, cache_ttl['wlan_networks'], timeouts['wlan_networks']
+        )
+        self.ipconfig_collector = IpConfigCollector(self.executor, cache_ttl['ipconfig'], timeouts['ipconfig'])
+        self.arp_collector = ArpCollector(self.executor, cache_ttl['arp'], timeouts['arp'])
+        
+        # The collectors only wait on child processes, so they run side by
+        # side; created on first use. The two netsh commands stay separate
+        # processes: chaining them in one cmd.exe would spawn three processes
+        # instead of two and serialize the interface query behind the scan.
+        self._pool: Optional[ThreadPoolExecutor] = None
+        
+        # Monotonic time until which the last passed compliance check holds
+        self._compliance_ok_until = 0.0
     
-    def collect_all(self) -> Dict:
+    def collect_all(self, force_refresh: bool = False) -> Dict:
         """
         Execute all data collectors and aggregate results.
         
+        Args:
+            force_refresh: Run every command even if a cached output is fresh
+        
         Returns:
             Dictionary containing all collection results
         """
         self.logger.info("Starting comprehensive data collection")
         
         # Validate compliance
+        self._validate_compliance()
+        
+        # Collect from all sources concurrently; wall time is that of the slowest command.
+        # One timestamp, taken once, stamps the collection and every source.
+        collection_timestamp = datetime.now().isoformat()
+        collected = self._run_collectors(
+            lambda name, collector: collector.collect(force_refresh, collection_timestamp)
+        )
+        
+        results = {'collection_timestamp': collection_timestamp}
+        results.update(collected)
+        
+        return self._check_results(results)
+    
+    def collect_and_normalize_all(self, normalizer, keep_raw: bool = True,
+                                  force_refresh: bool = False) -> Tuple[Dict, Dict]:
+        """
+        Collect all sources, normalizing each one as soon as its command returns.
+        
+        Normalizing the quick sources overlaps with waiting for the slow ones
+        (typically the network scan) instead of starting once every command
+        has finished.
+        
+        Args:
+            normalizer: DataNormalizationOrchestrator used for each source
+            keep_raw: Keep each source's stdout in the raw results. Without it
+                the text is released once it has been normalized.
+            force_refresh: Run every command even if a cached output is fresh
+        
+        Returns:
+            Tuple of (collection results as from collect_all(), normalized
+            data as from normalize_all())
+        """
+        self.logger.info("Starting comprehensive data collection")
+        
+        # Validate compliance
+        self._validate_compliance()
+        
+        collection_timestamp = datetime.now().isoformat()
+        
+        def collect_and_normalize(name: str, collector) -> Tuple[Dict, Dict]:
+            raw = collector.collect(force_refresh, collection_timestamp)
+            normalized = normalizer.normalize_source(name, raw)
+            if not keep_raw:
+                raw = {key: value for key, value in raw.items() if key != 'stdout'}
+            return raw, normalized
+        
+        collected = self._run_collectors(collect_and_normalize)
+        
+        results = {'collection_timestamp': collection_timestamp}
+        normalized = {'timestamp': collection_timestamp}
+        for name, (raw, normalized_source) in collected.items():
+            results[name] = raw
+            normalized[name] = normalized_source
+        
+        return self._check_results(results), normalized
+    
+    def _validate_compliance(self) -> None:
+        """
+        Validate that collection is permitted, reusing a recent pass.
+        
+        The check depends only on configuration loaded at startup, so a pass
+        is trusted for _COMPLIANCE_RECHECK_S seconds. A failed check raises
+        and is never cached.
+        
+        Raises:
+            PermissionError: If collection violates compliance rules
+        """
+        now = time.monotonic()
+        if now < self._compliance_ok_until:
+            return
+        
         self.compliance_validator.validate_operation('read_only_collection')
+        self._compliance_ok_until = now + _COMPLIANCE_RECHECK_S
+    
+    def _run_collectors(self, task: Callable[[str, object], object]) -> Dict:
+        """
+        Run a task for every collector concurrently.
         
-        # Collect from all sources
-        results = {
-            'collection_timestamp': datetime.now().isoformat(),
-            'wlan_interface': self.interface_collector.collect(),
-            'wlan_networks': self.networks_collector.collect(),
-            'ipconfig': self.ipconfig_collector.collect(),
-            'arp': self.arp_collector.collect()
+        Args:
+            task: Callable taking the data type name and the collector
+        
+        Returns:
+            Task results keyed by data type name, in collection order
+        """
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='collector')
+        
+        futures = {
+            'wlan_interface': self._pool.submit(task, 'wlan_interface', self.interface_collector),
+            'wlan_networks': self._pool.submit(task, 'wlan_networks', self.networks_collector),
+            'ipconfig': self._pool.submit(task, 'ipconfig', self.ipconfig_collector),
+            'arp': self._pool.submit(task, 'arp', self.arp_collector)
         }
         
+        return {name: future.result() for name, future in futures.items()}
+    
+    def _check_results(self, results: Dict) -> Dict:
+        """
+        Record collection failures in the results.
+        
+        Args:
+            results: Collection results keyed by data type name
+        
+        Returns:
+            The results with 'success' and 'failures' added
+        """
         # Check for failures
         failures = [
             name for name, data in results.items()
@@ -264,11 +558,11 @@ class DataCollectionOrchestrator:
         ]
         
         if failures:
-            self.logger.warning(f"Collection failures: {', '.join(failures)}")
+            self.logger.warning("Collection failures: %s", ', '.join(failures))
         
         results['success'] = len(failures) == 0
         results['failures'] = failures
         
-        self.logger.info(f"Data collection completed. Failures: {len(failures)}")
+        self.logger.info("Data collection completed. Failures: %d", len(failures))
         
         return results
@@ -5,10 +5,78 @@ Parses raw OS command outputs into structured, analyzable data.
 
 import re
 import logging
-from typing import Dict, List, Optional
+from dataclasses import dataclass
+from typing import Dict, Optional
 from datetime import datetime
 
 
+# Patterns used per output line, compiled once
+_MAC_RE = re.compile(r'(?:[0-9a-fA-F]{2}[:-]){5}[0-9a-fA-F]{2}')
+# IP, MAC and type of an 'arp -a' entry line; the first three whitespace
+# separated fields of a line that starts with a dotted quad.
+_ARP_LINE_RE = re.compile(r'(\d+\.\d+\.\d+\.\d+\S*)\s+(\S+)\s+(\S+)')
+
+# Raw 'ipconfig /all' labels ('   IPv4 Address. . . . ') -> property keys.
+# The label set is small and repeats on every scan; the cap only guards
+# against unexpected output.
+_IPCONFIG_KEYS: Dict[str, str] = {}
+_IPCONFIG_KEYS_MAX = 512
+
+
+def _parse_percent(value: str) -> int:
+    """Parse a netsh percentage such as '87%'."""
+    return int(value.rstrip('%'))
+
+
+# 'netsh wlan show networks mode=bssid' property lines by key: the record the
+# value belongs to (the network or its latest BSSID), the field it is stored
+# in and an optional converter. SSID and BSSID lines open a new record and
+# are handled separately.
+_NETWORK_LINE_FIELDS = {
+    'Network type': ('network', 'network_type', None),
+    'Authentication': ('network', 'authentication', None),
+    'Encryption': ('network', 'encryption', None),
+    'Signal': ('bssid', 'signal', _parse_percent),
+    'Channel': ('bssid', 'channel', int),
+    'Radio type': ('bssid', 'radio_type', None)
+}
+_KEY_INDEX_CHARS = ' \t0123456789'
+
+
+@dataclass
+class NormalizedObservation:
+    """
+    Typed view of the frequently read fields of a normalized observation.
+    
+    Normalized observations remain plain dictionaries because they are
+    persisted as JSON and passed to every analyzer. The view is built once
+    per observation for code that reads the same fields repeatedly, instead
+    of re-walking the nested dictionaries on each access.
+    """
+    __slots__ = ('timestamp', 'bssid_count')
+    
+    timestamp: Optional[str]
+    bssid_count: int
+    
+    @classmethod
+    def from_dict(cls, observation: Dict) -> 'NormalizedObservation':
+        """
+        Build the view from a normalized observation dictionary.
+        
+        Args:
+            observation: Normalized observation dictionary
+        
+        Returns:
+            NormalizedObservation instance
+        """
+        summary = (observation.get('wlan_networks') or {}).get('summary') or {}
+        
+        return cls(
+            timestamp=observation.get('timestamp'),
+            bssid_count=summary.get('bssid_count', 0)
+        )
+
+
 class WlanInterfaceNormalizer:
     """
     Normalizes output from 'netsh wlan show interfaces'.
@@ -37,12 +105,13 @@ class WlanInterfaceNormalizer:
         
         stdout = raw_data.get('stdout', '')
         
-        # Parse key-value pairs
+        # Parse key-value pairs. str.partition per line measures several
+        # times faster than a multiline findall on this output: the lazy
+        # key/value groups of an equivalent pattern backtrack on every line.
         interface_data = {}
         for line in stdout.split('\n'):
-            line = line.strip()
-            if ':' in line:
-                key, value = line.split(':', 1)
+            key, sep, value = line.strip().partition(':')
+            if sep:
                 key = key.strip().lower().replace(' ', '_')
                 value = value.strip()
                 if value:
@@ -58,6 +127,16 @@ class WlanInterfaceNormalizer:
 class WlanNetworksNormalizer:
     """
     Normalizes output from 'netsh wlan show networks mode=bssid'.
+    
+    Network and BSSID records are emitted as plain dictionaries rather than
+    slotted objects: they are persisted as JSON as-is and every analyzer
+    reads them that way, so objects would have to be converted back on each
+    scan. Analyzers needing per-BSSID fields use the cached column view
+    (analysis.features.bssid_columns) instead.
+    
+    Field values are str, int or None and the summary collections are sorted
+    lists, so the result serializes with orjson or json without a custom
+    encoder and identical scans produce identical output.
     """
     
     def __init__(self):
@@ -89,100 +168,94 @@ class WlanNetworksNormalizer:
         stdout = raw_data.get('stdout', '')
         networks = []
         current_network = None
+        # Latest BSSID of the current network, which BSSID properties go to
+        current_bssid = None
         
         for line in stdout.split('\n'):
-            line = line.strip()
+            key, sep, value = line.strip().partition(':')
+            # Keys read 'SSID 1', 'BSSID 2', 'Signal', ...; drop the index
+            key = key.rstrip(_KEY_INDEX_CHARS)
             
             # New network
-            if line.startswith('SSID'):
+            if key == 'SSID':
                 # Save previous network
                 if current_network:
                     networks.append(current_network)
                 
                 # Start new network
-                parts = line.split(':', 1)
-                ssid = parts[1].strip() if len(parts) > 1 else ''
                 current_network = {
-                    'ssid': ssid,
+                    'ssid': value.strip(),
                     'bssids': []
                 }
+                current_bssid = None
+                continue
             
-            # Network type
-            elif 'Network type' in line:
-                if current_network:
-                    parts = line.split(':', 1)
-                    current_network['network_type'] = parts[1].strip() if len(parts) > 1 else ''
-            
-            # Authentication
-            elif 'Authentication' in line:
-                if current_network:
-                    parts = line.split(':', 1)
-                    current_network['authentication'] = parts[1].strip() if len(parts) > 1 else ''
-            
-            # Encryption
-            elif 'Encryption' in line:
-                if current_network:
-                    parts = line.split(':', 1)
-                    current_network['encryption'] = parts[1].strip() if len(parts) > 1 else ''
+            if not current_network:
+                continue
             
             # BSSID
-            elif 'BSSID' in line:
-                if current_network:
-                    parts = line.split(':', 1)
-                    if len(parts) > 1:
-                        bssid = parts[1].strip()
-                        # Extract MAC address pattern
-                        mac_match = re.search(r'([0-9a-fA-F]{2}[:-]){5}[0-9a-fA-F]{2}', bssid)
-                        if mac_match:
-                            current_network['bssids'].append({
-                                'bssid': mac_match.group(0),
-                                'signal': None,
-                                'channel': None,
-                                'radio_type': None
-                            })
+            if key == 'BSSID':
+                # Extract MAC address pattern
+                mac_match = _MAC_RE.search(value)
+                if mac_match:
+                    current_bssid = {
+                        'bssid': mac_match.group(0),
+                        'signal': None,
+                        'channel': None,
+                        'radio_type': None
+                    }
+                    current_network['bssids'].append(current_bssid)
+                continue
             
-            # Signal
-            elif 'Signal' in line and current_network and current_network['bssids']:
-                parts = line.split(':', 1)
-                if len(parts) > 1:
-                    signal_str = parts[1].strip().rstrip('%')
-                    try:
-                        current_network['bssids'][-1]['signal'] = int(signal_str)
-                    except ValueError:
-                        pass
+            # Network or BSSID property
+            field = _NETWORK_LINE_FIELDS.get(key)
+            if field is None:
+                continue
             
-            # Channel
-            elif 'Channel' in line and current_network and current_network['bssids']:
-                parts = line.split(':', 1)
-                if len(parts) > 1:
+            scope, name, convert = field
+            if scope == 'network':
+                current_network[name] = value.strip()
+            elif sep and current_bssid is not None:
+                value = value.strip()
+                if convert is not None:
                     try:
-                        current_network['bssids'][-1]['channel'] = int(parts[1].strip())
+                        value = convert(value)
                     except ValueError:
-                        pass
-            
-            # Radio type
-            elif 'Radio type' in line and current_network and current_network['bssids']:
-                parts = line.split(':', 1)
-                if len(parts) > 1:
-                    current_network['bssids'][-1]['radio_type'] = parts[1].strip()
+                        continue
+                current_bssid[name] = value
         
         # Save last network
         if current_network:
             networks.append(current_network)
         
-        # Flatten BSSID list
+        # Flatten BSSID list, collecting the summary sets on the way
         all_bssids = []
+        ssids, channels, radio_types = set(), set(), set()
         for network in networks:
+            ssid = network.get('ssid', '')
+            if ssid:
+                ssids.add(ssid)
+            network_type = network.get('network_type', '')
+            authentication = network.get('authentication', '')
+            encryption = network.get('encryption', '')
+            
             for bssid_info in network.get('bssids', []):
+                channel = bssid_info.get('channel')
+                if channel:
+                    channels.add(channel)
+                radio_type = bssid_info.get('radio_type')
+                if radio_type:
+                    radio_types.add(radio_type)
+                
                 all_bssids.append({
-                    'ssid': network.get('ssid', ''),
+                    'ssid': ssid,
                     'bssid': bssid_info.get('bssid'),
                     'signal': bssid_info.get('signal'),
-                    'channel': bssid_info.get('channel'),
-                    'radio_type': bssid_info.get('radio_type'),
-                    'network_type': network.get('network_type', ''),
-                    'authentication': network.get('authentication', ''),
-                    'encryption': network.get('encryption', '')
+                    'channel': channel,
+                    'radio_type': radio_type,
+                    'network_type': network_type,
+                    'authentication': authentication,
+                    'encryption': encryption
                 })
         
         return {
@@ -193,9 +266,9 @@ class WlanNetworksNormalizer:
             'summary': {
                 'network_count': len(networks),
                 'bssid_count': len(all_bssids),
-                'ssids': list(set(n['ssid'] for n in networks if n.get('ssid'))),
-                'channels': list(set(b['channel'] for b in all_bssids if b.get('channel'))),
-                'radio_types': list(set(b['radio_type'] for b in all_bssids if b.get('radio_type')))
+                'ssids': sorted(ssids),
+                'channels': sorted(channels),
+                'radio_types': sorted(radio_types)
             }
         }
 
@@ -230,23 +303,32 @@ class IpConfigNormalizer:
         adapters = []
         current_adapter = None
         
+        property_keys = _IPCONFIG_KEYS
+        
         for line in stdout.split('\n'):
+            key, sep, value = line.partition(':')
+            if not sep:
+                continue
+            
             # New adapter
-            if line and not line.startswith(' ') and ':' in line:
+            if not line.startswith(' '):
                 if current_adapter:
                     adapters.append(current_adapter)
                 current_adapter = {
-                    'name': line.split(':')[0].strip(),
+                    'name': key.strip(),
                     'properties': {}
                 }
             
             # Adapter property
-            elif line.startswith(' ') and ':' in line and current_adapter:
-                key, value = line.split(':', 1)
-                key = key.strip().lower().replace(' ', '_').replace('.', '')
+            elif current_adapter:
                 value = value.strip()
                 if value:
-                    current_adapter['properties'][key] = value
+                    name = property_keys.get(key)
+                    if name is None:
+                        name = key.strip().lower().replace(' ', '_').replace('.', '')
+                        if len(property_keys) < _IPCONFIG_KEYS_MAX:
+                            property_keys[key] = name
+                    current_adapter['properties'][name] = value
         
         if current_adapter:
             adapters.append(current_adapter)
@@ -296,17 +378,18 @@ class ArpNormalizer:
             
             # Interface line
             if line.startswith('Interface:'):
-                current_interface = line.split('Interface:')[1].strip()
+                current_interface = line.partition('Interface:')[2].strip()
             
             # ARP entry
-            elif re.match(r'\d+\.\d+\.\d+\.\d+', line):
-                parts = line.split()
-                if len(parts) >= 3:
+            else:
+                match = _ARP_LINE_RE.match(line)
+                if match:
+                    ip, mac, entry_type = match.groups()
                     entries.append({
                         'interface': current_interface,
-                        'ip': parts[0],
-                        'mac': parts[1],
-                        'type': parts[2] if len(parts) > 2 else ''
+                        'ip': ip,
+                        'mac': mac,
+                        'type': entry_type
                     })
         
         return {
@@ -332,6 +415,14 @@ class DataNormalizationOrchestrator:
         self.networks_normalizer = WlanNetworksNormalizer()
         self.ipconfig_normalizer = IpConfigNormalizer()
         self.arp_normalizer = ArpNormalizer()
+        
+        # Normalizer per collector data type, in output order
+        self._normalizers = {
+            'wlan_interface': self.interface_normalizer,
+            'wlan_networks': self.networks_normalizer,
+            'ipconfig': self.ipconfig_normalizer,
+            'arp': self.arp_normalizer
+        }
     
     def normalize_all(self, raw_collection: Dict) -> Dict:
         """
@@ -345,22 +436,28 @@ class DataNormalizationOrchestrator:
         """
         self.logger.info("Starting data normalization")
         
-        normalized = {
-            'timestamp': raw_collection.get('collection_timestamp'),
-            'wlan_interface': self.interface_normalizer.normalize(
-                raw_collection.get('wlan_interface', {})
-            ),
-            'wlan_networks': self.networks_normalizer.normalize(
-                raw_collection.get('wlan_networks', {})
-            ),
-            'ipconfig': self.ipconfig_normalizer.normalize(
-                raw_collection.get('ipconfig', {})
-            ),
-            'arp': self.arp_normalizer.normalize(
-                raw_collection.get('arp', {})
-            )
-        }
+        # Serial on purpose: parsing even an unusually large networks listing
+        # takes about a millisecond, far less than starting worker processes.
+        # Scans normalize each source as its command finishes instead (see
+        # DataCollectionOrchestrator.collect_and_normalize_all).
+        normalized = {'timestamp': raw_collection.get('collection_timestamp')}
+        for data_type, normalizer in self._normalizers.items():
+            normalized[data_type] = normalizer.normalize(raw_collection.get(data_type, {}))
         
         self.logger.info("Data normalization completed")
         
         return normalized
+    
+    def normalize_source(self, data_type: str, raw_data: Dict) -> Dict:
+        """
+        Normalize the raw data of a single collector.
+        
+        Args:
+            data_type: Collector data type ('wlan_interface', 'wlan_networks',
+                'ipconfig' or 'arp')
+            raw_data: Raw collection data dictionary of that collector
+        
+        Returns:
+            Normalized data dictionary
+        """
+        return self._normalizers[data_type].normalize(raw_data)
@@ -5,13 +5,53 @@ Generates human and machine-readable reports of analytical findings.
 
 import json
 import logging
+import os
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
+
+from src.analysis.result import AnalysisResult
+
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON serialization
+    orjson = None
+
+# Same layout as the stdlib encoder with indent=2; numpy scalars and non-str
+# keys are accepted as the storage layer does
+_ORJSON_OPTIONS = (
+    orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    if orjson is not None else 0
+)
+
+
+# Rules and fixed blocks of the text report, built once
+_RULE = "=" * 70
+_SECTION_RULE = "-" * 70
+_REPORT_HEADER = f"{_RULE}\nWi-Fi Environmental Analysis Report\n{_RULE}\n"
+_REPORT_FOOTER = (
+    f"\n{_RULE}\n"
+    "Report generated by Ambient Wi-Fi Monitor\n"
+    "Environmental sensing and analysis system\n"
+    f"{_RULE}"
+)
+
+# Format spec of a fingerprint feature value by type: floats (and subclasses
+# such as numpy.float64) to two decimals, everything else as-is. Filled in as
+# value types are first seen.
+_FEATURE_FORMAT_SPECS: Dict[type, str] = {float: '.2f', int: ''}
+
+# Saved report file extension per format; other formats use their own name
+_REPORT_EXTENSIONS = {'text': 'txt', 'json': 'json'}
 
 
 class TextReportGenerator:
     """
     Generates human-readable text reports.
+    
+    The report is assembled directly in Python rather than rendered from a
+    template: the layout is small and mostly conditional on verbosity, and a
+    report builds in tens of microseconds, so a template engine would add a
+    dependency and its import cost without a measurable gain.
     """
     
     def __init__(self, config: Dict):
@@ -28,86 +68,87 @@ class TextReportGenerator:
         self.verbosity = reporting_config.get('verbosity', 'standard')
         self.timestamp_format = reporting_config.get('timestamp_format', '%Y-%m-%d %H:%M:%S')
     
-    def generate(self, analysis_results: Dict) -> str:
+    def generate(self, analysis_results: AnalysisResult) -> str:
         """
         Generate comprehensive text report.
         
         Args:
-            analysis_results: Complete analysis results dictionary
+            analysis_results: Complete analysis results
         
         Returns:
             Formatted text report
         """
+        # Each entry is one or more lines; consecutive fixed lines are written
+        # as a single multi-line entry to keep the number of pieces down
         lines = []
         
         # Header
-        lines.append("=" * 70)
-        lines.append("Wi-Fi Environmental Analysis Report")
-        lines.append("=" * 70)
-        lines.append("")
+        lines.append(_REPORT_HEADER)
         
         # Metadata
-        metadata = analysis_results.get('metadata', {})
-        timestamp = metadata.get('timestamp', datetime.now().isoformat())
+        metadata = analysis_results.metadata
+        # The clock is only read when the metadata carries no timestamp
+        if 'timestamp' in metadata:
+            timestamp = metadata['timestamp']
+        else:
+            timestamp = datetime.now().isoformat()
         obs_num = metadata.get('observation_number', 'N/A')
         
         try:
-            dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-            timestamp_str = dt.strftime(self.timestamp_format)
-        except:
+            # fromisoformat() only accepts a 'Z' UTC suffix from Python 3.11
+            iso_timestamp = timestamp[:-1] + '+00:00' if timestamp.endswith('Z') else timestamp
+            timestamp_str = datetime.fromisoformat(iso_timestamp).strftime(self.timestamp_format)
+        except (AttributeError, ValueError):
             timestamp_str = timestamp
         
-        lines.append(f"Timestamp: {timestamp_str}")
-        lines.append(f"Observation: #{obs_num}")
-        lines.append("")
+        lines.append(f"Timestamp: {timestamp_str}\nObservation: #{obs_num}\n")
         
         # Environmental Status
-        lines.append("ENVIRONMENTAL STATUS")
-        lines.append("-" * 70)
+        lines.append(f"ENVIRONMENTAL STATUS\n{_SECTION_RULE}")
         
-        baseline_comparison = analysis_results.get('baseline_comparison', {})
+        baseline_comparison = analysis_results.baseline_comparison
         status = baseline_comparison.get('status', 'UNKNOWN')
         confidence = baseline_comparison.get('confidence', 0.0)
         
-        lines.append(f"Status: {status} (confidence: {confidence:.2f})")
-        
         current_count = baseline_comparison.get('current_bssid_count', 0)
         baseline_mean = baseline_comparison.get('baseline_mean', 0)
         
-        lines.append(f"  - Activity level: {current_count} BSSIDs detected")
+        lines.append(
+            f"Status: {status} (confidence: {confidence:.2f})\n"
+            f"  - Activity level: {current_count} BSSIDs detected"
+        )
         if baseline_mean > 0:
-            lines.append(f"  - Baseline average: {baseline_mean:.1f} BSSIDs")
             deviation = baseline_comparison.get('deviation_percent', 0)
-            lines.append(f"  - Deviation: {deviation:+.1f}%")
-        
-        lines.append("")
+            lines.append(
+                f"  - Baseline average: {baseline_mean:.1f} BSSIDs\n"
+                f"  - Deviation: {deviation:+.1f}%"
+            )
         
         # Current Environment Summary
-        lines.append("CURRENT ENVIRONMENT")
-        lines.append("-" * 70)
+        lines.append(f"\nCURRENT ENVIRONMENT\n{_SECTION_RULE}")
         
-        current_obs = analysis_results.get('current_observation', {})
+        current_obs = analysis_results.current_observation
         networks = current_obs.get('wlan_networks', {})
         summary = networks.get('summary', {})
         
-        lines.append(f"Networks (SSIDs): {summary.get('network_count', 0)}")
-        lines.append(f"Access Points (BSSIDs): {summary.get('bssid_count', 0)}")
+        lines.append(
+            f"Networks (SSIDs): {summary.get('network_count', 0)}\n"
+            f"Access Points (BSSIDs): {summary.get('bssid_count', 0)}"
+        )
         
+        # The networks normalizer emits the summary channels already sorted
         channels = summary.get('channels', [])
         if channels:
-            lines.append(f"Channels in use: {', '.join(map(str, sorted(channels)))}")
+            lines.append(f"Channels in use: {', '.join(map(str, channels))}")
         
         radio_types = summary.get('radio_types', [])
         if radio_types:
             lines.append(f"Radio types: {', '.join(radio_types)}")
         
-        lines.append("")
-        
         # Temporal Analysis
-        temporal = analysis_results.get('temporal_analysis', {})
+        temporal = analysis_results.temporal_analysis
         if temporal:
-            lines.append("TEMPORAL TRENDS")
-            lines.append("-" * 70)
+            lines.append(f"\nTEMPORAL TRENDS\n{_SECTION_RULE}")
             
             interpretation = temporal.get('interpretation', '')
             if interpretation:
@@ -117,26 +158,24 @@ class TextReportGenerator:
                 windows = temporal.get('windows', {})
                 for window_name, window_data in windows.items():
                     if window_data.get('available'):
-                        lines.append(f"\n{window_name.replace('_', ' ').title()}:")
-                        lines.append(f"  Mean: {window_data.get('mean', 0):.1f}")
-                        lines.append(f"  Range: {window_data.get('min', 0)} - {window_data.get('max', 0)}")
-                        lines.append(f"  Change: {window_data.get('change_percent', 0):+.1f}%")
-            
-            lines.append("")
+                        lines.append(
+                            f"\n{window_name.replace('_', ' ').title()}:\n"
+                            f"  Mean: {window_data.get('mean', 0):.1f}\n"
+                            f"  Range: {window_data.get('min', 0)} - {window_data.get('max', 0)}\n"
+                            f"  Change: {window_data.get('change_percent', 0):+.1f}%"
+                        )
         
         # Anomaly Detection
-        anomaly_results = analysis_results.get('anomaly_detection', {})
+        anomaly_results = analysis_results.anomaly_detection
         if anomaly_results:
-            lines.append("ANOMALY DETECTION")
-            lines.append("-" * 70)
+            lines.append(f"\nANOMALY DETECTION\n{_SECTION_RULE}")
             
             anomaly_count = anomaly_results.get('anomaly_count', 0)
             
             if anomaly_count == 0:
                 lines.append("No anomalies detected")
             else:
-                lines.append(f"Detected: {anomaly_count} anomaly/anomalies")
-                lines.append("")
+                lines.append(f"Detected: {anomaly_count} anomaly/anomalies\n")
                 
                 anomalies = anomaly_results.get('anomalies', [])
                 for i, anomaly in enumerate(anomalies, 1):
@@ -144,46 +183,40 @@ class TextReportGenerator:
                     confidence = anomaly.get('confidence', 0.0)
                     description = anomaly.get('description', '')
                     
-                    lines.append(f"{i}. [{severity}] {description}")
-                    lines.append(f"   Confidence: {confidence:.2f}")
-            
-            lines.append("")
+                    lines.append(f"{i}. [{severity}] {description}\n   Confidence: {confidence:.2f}")
         
         # Environmental Fingerprint
-        fingerprint = analysis_results.get('fingerprint', {})
+        fingerprint = analysis_results.fingerprint
         if fingerprint:
-            lines.append("ENVIRONMENTAL FINGERPRINT")
-            lines.append("-" * 70)
+            lines.append(f"\nENVIRONMENTAL FINGERPRINT\n{_SECTION_RULE}")
             
             fp_hash = fingerprint.get('hash', 'N/A')
             lines.append(f"Fingerprint: {fp_hash}")
             
-            baseline_fp = analysis_results.get('baseline_fingerprint', {})
+            baseline_fp = analysis_results.baseline_fingerprint
             if baseline_fp:
-                comparison = analysis_results.get('fingerprint_comparison', {})
+                comparison = analysis_results.fingerprint_comparison
                 if comparison:
                     similarity = comparison.get('overall_similarity', 0.0)
                     interpretation = comparison.get('interpretation', '')
-                    lines.append(f"Match to baseline: {similarity*100:.1f}%")
-                    lines.append(f"{interpretation}")
+                    lines.append(f"Match to baseline: {similarity*100:.1f}%\n{interpretation}")
             
             if self.verbosity == 'detailed':
                 features = fingerprint.get('features', {})
                 if features:
                     lines.append("\nFeatures:")
                     for key, value in features.items():
-                        if isinstance(value, float):
-                            lines.append(f"  {key}: {value:.2f}")
-                        else:
-                            lines.append(f"  {key}: {value}")
-            
-            lines.append("")
+                        value_type = type(value)
+                        spec = _FEATURE_FORMAT_SPECS.get(value_type)
+                        if spec is None:
+                            spec = '.2f' if isinstance(value, float) else ''
+                            _FEATURE_FORMAT_SPECS[value_type] = spec
+                        lines.append(f"  {key}: {value:{spec}}")
         
         # Distance Analysis
-        distance_analysis = analysis_results.get('distance_analysis', {})
+        distance_analysis = analysis_results.distance_analysis
         if distance_analysis and distance_analysis.get('enabled'):
-            lines.append("DISTANCE ESTIMATION")
-            lines.append("-" * 70)
+            lines.append(f"\nDISTANCE ESTIMATION\n{_SECTION_RULE}")
             
             stats = distance_analysis.get('statistics', {})
             if stats:
@@ -192,8 +225,10 @@ class TextReportGenerator:
                 min_d = stats.get('min_distance', 0)
                 max_d = stats.get('max_distance', 0)
                 
-                lines.append(f"Average distance: {mean:.1f}m (σ={std:.1f}m)")
-                lines.append(f"Range: {min_d:.1f}m - {max_d:.1f}m")
+                lines.append(
+                    f"Average distance: {mean:.1f}m (σ={std:.1f}m)\n"
+                    f"Range: {min_d:.1f}m - {max_d:.1f}m"
+                )
             
             # Zone distribution
             zone_dist = distance_analysis.get('zone_distribution', {})
@@ -207,15 +242,24 @@ class TextReportGenerator:
             
             # Show closest/farthest if detailed
             if self.verbosity == 'detailed':
-                distances = distance_analysis.get('distances', [])
-                if distances:
-                    valid = [d for d in distances if d.get('estimated_distance_m') is not None]
-                    if valid:
-                        closest = min(valid, key=lambda x: x['estimated_distance_m'])
-                        farthest = max(valid, key=lambda x: x['estimated_distance_m'])
-                        
-                        lines.append(f"\nClosest AP: {closest['ssid'] or 'Hidden'} ({closest['estimated_distance_m']:.1f}m)")
-                        lines.append(f"Farthest AP: {farthest['ssid'] or 'Hidden'} ({farthest['estimated_distance_m']:.1f}m)")
+                # One pass for both extremes; the first of equal distances wins
+                closest = farthest = None
+                for entry in distance_analysis.get('distances', []):
+                    distance = entry.get('estimated_distance_m')
+                    if distance is None:
+                        continue
+                    if closest is None:
+                        closest = farthest = entry
+                        closest_m = farthest_m = distance
+                    elif distance < closest_m:
+                        closest, closest_m = entry, distance
+                    elif distance > farthest_m:
+                        farthest, farthest_m = entry, distance
+                if closest is not None:
+                    lines.append(
+                        f"\nClosest AP: {closest['ssid'] or 'Hidden'} ({closest_m:.1f}m)\n"
+                        f"Farthest AP: {farthest['ssid'] or 'Hidden'} ({farthest_m:.1f}m)"
+                    )
             
             # Disclaimer
             disclaimer = distance_analysis.get('disclaimer', '')
@@ -225,31 +269,25 @@ class TextReportGenerator:
                 if self.verbosity == 'detailed':
                     lines.append(f"Parameters: n={params.get('path_loss_exponent', 0)}, "
                                f"TxPower={params.get('tx_power_dbm', 0)}dBm")
-            
-            lines.append("")
         
         # Baseline Information
         if self.verbosity in ['standard', 'detailed']:
-            baseline_info = analysis_results.get('baseline_info', {})
+            baseline_info = analysis_results.baseline_info
             if baseline_info:
-                lines.append("BASELINE INFORMATION")
-                lines.append("-" * 70)
+                lines.append(f"\nBASELINE INFORMATION\n{_SECTION_RULE}")
                 
                 status = baseline_info.get('status', 'unknown')
                 obs_count = baseline_info.get('observation_count', 0)
                 confidence = baseline_info.get('confidence', 0.0)
                 
-                lines.append(f"Status: {status}")
-                lines.append(f"Observations: {obs_count}")
-                lines.append(f"Confidence: {confidence:.2f}")
-                
-                lines.append("")
+                lines.append(
+                    f"Status: {status}\n"
+                    f"Observations: {obs_count}\n"
+                    f"Confidence: {confidence:.2f}"
+                )
         
         # Footer
-        lines.append("=" * 70)
-        lines.append("Report generated by Ambient Wi-Fi Monitor")
-        lines.append("Environmental sensing and analysis system")
-        lines.append("=" * 70)
+        lines.append(_REPORT_FOOTER)
         
         return "\n".join(lines)
 
@@ -272,43 +310,51 @@ class JSONReportGenerator:
         reporting_config = config.get('reporting', {})
         self.include_raw = reporting_config.get('include_raw', False)
     
-    def generate(self, analysis_results: Dict) -> str:
+    def generate(self, analysis_results: AnalysisResult) -> str:
         """
         Generate JSON report.
         
         Args:
-            analysis_results: Complete analysis results dictionary
+            analysis_results: Complete analysis results
         
         Returns:
             JSON-formatted report string
         """
+        baseline_comparison = analysis_results.baseline_comparison
+        anomaly_detection = analysis_results.anomaly_detection
+        fingerprint = analysis_results.fingerprint
+        fingerprint_comparison = analysis_results.fingerprint_comparison
+        
         # Create simplified report structure
         report = {
-            'metadata': analysis_results.get('metadata', {}),
+            'metadata': analysis_results.metadata,
             'status': {
-                'environmental_status': analysis_results.get('baseline_comparison', {}).get('status'),
-                'confidence': analysis_results.get('baseline_comparison', {}).get('confidence'),
-                'anomaly_count': analysis_results.get('anomaly_detection', {}).get('anomaly_count', 0)
+                'environmental_status': baseline_comparison.get('status'),
+                'confidence': baseline_comparison.get('confidence'),
+                'anomaly_count': anomaly_detection.get('anomaly_count', 0)
             },
             'metrics': {
-                'bssid_count': analysis_results.get('baseline_comparison', {}).get('current_bssid_count'),
-                'baseline_mean': analysis_results.get('baseline_comparison', {}).get('baseline_mean'),
-                'deviation_percent': analysis_results.get('baseline_comparison', {}).get('deviation_percent')
+                'bssid_count': baseline_comparison.get('current_bssid_count'),
+                'baseline_mean': baseline_comparison.get('baseline_mean'),
+                'deviation_percent': baseline_comparison.get('deviation_percent')
             },
-            'temporal_analysis': analysis_results.get('temporal_analysis', {}),
-            'anomalies': analysis_results.get('anomaly_detection', {}).get('anomalies', []),
+            'temporal_analysis': analysis_results.temporal_analysis,
+            'anomalies': anomaly_detection.get('anomalies', []),
             'fingerprint': {
-                'hash': analysis_results.get('fingerprint', {}).get('hash'),
-                'features': analysis_results.get('fingerprint', {}).get('features', {}),
-                'baseline_similarity': analysis_results.get('fingerprint_comparison', {}).get('overall_similarity') if analysis_results.get('fingerprint_comparison') else None
+                'hash': fingerprint.get('hash'),
+                'features': fingerprint.get('features', {}),
+                'baseline_similarity': fingerprint_comparison.get('overall_similarity') if fingerprint_comparison else None
             },
-            'distance_analysis': analysis_results.get('distance_analysis', {})
+            'distance_analysis': analysis_results.distance_analysis
         }
         
         # Optionally include raw observation data
         if self.include_raw:
-            report['raw_observation'] = analysis_results.get('current_observation', {})
+            raw_observation = analysis_results.current_observation
+            report['raw_observation'] = {k: v for k, v in raw_observation.items() if k != '_derived'}
         
+        if orjson is not None:
+            return orjson.dumps(report, option=_ORJSON_OPTIONS).decode('utf-8')
         return json.dumps(report, indent=2, ensure_ascii=False)
 
 
@@ -331,69 +377,92 @@ class ReportOrchestrator:
         self.text_generator = TextReportGenerator(config)
         self.json_generator = JSONReportGenerator(config)
         
+        # Generator per report format; formats without one are ignored
+        self._generators = {
+            'text': self.text_generator.generate,
+            'json': self.json_generator.generate
+        }
+        
         # Configuration
         reporting_config = config.get('reporting', {})
         self.formats = reporting_config.get('formats', ['text', 'json'])
+        self.write_buffer_bytes = reporting_config.get('write_buffer_bytes', 512 * 1024)
+        
+        storage = config.get('storage', {})
+        self.reports_path = os.path.join(
+            storage.get('data_dir', 'data'), storage.get('reports_dir', 'reports')
+        )
+        # The reports directory is created on the first save only
+        self._reports_dir_ready = False
     
-    def generate_reports(self, analysis_results: Dict) -> Dict[str, str]:
+    def generate_reports(self, analysis_results: AnalysisResult) -> Dict[str, str]:
         """
         Generate reports in all configured formats.
         
         Args:
-            analysis_results: Complete analysis results dictionary
+            analysis_results: Complete analysis results
         
         Returns:
             Dictionary mapping format name to report content
         """
-        self.logger.info(f"Generating reports in formats: {', '.join(self.formats)}")
+        self.logger.info("Generating reports in formats: %s", ', '.join(self.formats))
         
+        # Generated one after the other: each report takes tens of
+        # microseconds and holds the GIL (orjson included), about what a
+        # thread pool round trip costs
         reports = {}
-        
-        if 'text' in self.formats:
-            reports['text'] = self.text_generator.generate(analysis_results)
-        
-        if 'json' in self.formats:
-            reports['json'] = self.json_generator.generate(analysis_results)
+        for fmt in self.formats:
+            generate = self._generators.get(fmt)
+            if generate is not None:
+                reports[fmt] = generate(analysis_results)
         
         return reports
     
-    def save_reports(self, reports: Dict[str, str], storage_orchestrator) -> Dict[str, str]:
+    def save_reports(self, reports: Dict[str, Union[str, bytes]], storage_orchestrator) -> Dict[str, str]:
         """
         Save generated reports to disk.
         
+        Reports arrive fully generated rather than being serialized into the
+        file here: the text report is printed before it is saved, and scans
+        hand saving to the background writer, which then only does I/O and
+        never reads the analysis results of a scan that has moved on.
+        
         Args:
-            reports: Dictionary of reports by format
+            reports: Dictionary of reports by format, as text or as UTF-8
+                encoded bytes
             storage_orchestrator: StorageOrchestrator instance
         
         Returns:
             Dictionary mapping format to file path
         """
-        import os
-        
-        storage = self.config.get('storage', {})
-        base_dir = storage.get('data_dir', 'data')
-        reports_dir = storage.get('reports_dir', 'reports')
-        reports_path = os.path.join(base_dir, reports_dir)
-        
-        os.makedirs(reports_path, exist_ok=True)
+        if not self._reports_dir_ready:
+            os.makedirs(self.reports_path, exist_ok=True)
+            self._reports_dir_ready = True
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         saved_files = {}
         
         for fmt, content in reports.items():
-            if fmt == 'text':
-                filename = f"report_{timestamp}.txt"
-            elif fmt == 'json':
-                filename = f"report_{timestamp}.json"
-            else:
-                filename = f"report_{timestamp}.{fmt}"
-            
-            filepath = os.path.join(reports_path, filename)
+            filename = f"report_{timestamp}.{_REPORT_EXTENSIONS.get(fmt, fmt)}"
+            filepath = os.path.join(self.reports_path, filename)
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # Encoded once and written through a single buffer, so the report
+            # reaches the OS in as few write calls as its size allows. It is
+            # written beside the target and renamed into place, so readers
+            # never see a partial report.
+            tmp_path = filepath + '.tmp'
+            try:
+                if isinstance(content, str):
+                    content = content.encode('utf-8')
+                with open(tmp_path, 'wb', buffering=self.write_buffer_bytes) as f:
+                    f.write(content)
+                os.replace(tmp_path, filepath)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
             
             saved_files[fmt] = filepath
-            self.logger.info(f"Saved {fmt} report to {filepath}")
+            self.logger.info("Saved %s report to %s", fmt, filepath)
         
         return saved_files
@@ -3,14 +3,215 @@ Ambient Wi-Fi Monitor - Storage Module
 Handles persistence of raw data, normalized data, baselines, and metadata.
 """
 
+import atexit
 import json
 import os
-import csv
 import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON (de)serialization
+    orjson = None
+
+# Match the stdlib encoder: indented output, numpy scalars, non-str keys
+# (e.g. int hour keys) written as strings
+_ORJSON_OPTIONS = (
+    orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    if orjson is not None else 0
+)
+
+
+def _dump_json(data: Any, filepath: str) -> None:
+    """
+    Write data to a JSON file, using orjson when it is installed.
+    
+    The document is serialized in full, written to a temporary file beside
+    the target and renamed into place, so neither a serialization error nor
+    an interrupted write leaves a truncated file behind.
+    
+    Args:
+        data: JSON-serializable data
+        filepath: Destination file path
+    """
+    if orjson is not None:
+        payload = orjson.dumps(data, option=_ORJSON_OPTIONS)
+    else:
+        payload = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    
+    tmp_path = filepath + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, filepath)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _load_json(filepath: str) -> Any:
+    """
+    Read a JSON file, using orjson when it is installed.
+    
+    Args:
+        filepath: Source file path
+    
+    Returns:
+        Parsed data
+    """
+    if orjson is not None:
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
+    
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _split_timestamp(timestamp: str) -> Tuple[str, str]:
+    """
+    Get the file name stamp and the ISO form of an observation timestamp.
+    
+    Timestamps produced by datetime.isoformat() ('YYYY-MM-DDTHH:MM:SS' with
+    optional microseconds), as the collectors write them, are sliced
+    directly; any other ISO 8601 form is parsed.
+    
+    Args:
+        timestamp: ISO 8601 timestamp
+    
+    Returns:
+        Tuple of (stamp such as '20240115_143022', ISO timestamp)
+    """
+    if (len(timestamp) in (19, 26) and timestamp[10] == 'T' and timestamp[13] == ':'
+            and timestamp[16] == ':' and (len(timestamp) == 19 or timestamp[19] == '.')):
+        stamp = (timestamp[0:4] + timestamp[5:7] + timestamp[8:10] + '_' +
+                 timestamp[11:13] + timestamp[14:16] + timestamp[17:19])
+        return stamp, timestamp
+    
+    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    return dt.strftime('%Y%m%d_%H%M%S'), dt.isoformat()
+
+
+_BSSID_CSV_HEADER = 'timestamp,ssid,bssid,signal,channel,radio_type,authentication,encryption\r\n'
+
+
+def _csv_field(value: Any) -> str:
+    """
+    Format a value as a CSV field, quoted the way csv.QUOTE_MINIMAL does.
+    
+    Args:
+        value: Field value; None is written as an empty field
+    
+    Returns:
+        Field text
+    """
+    if value is None:
+        return ''
+    text = value if isinstance(value, str) else str(value)
+    if ',' in text or '"' in text or '\n' in text or '\r' in text:
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+class _DirectoryListing:
+    """
+    Names of a store's data files, newest first, cached by directory mtime.
+    
+    The directory is only listed again once its modification time changes.
+    Files saved by the owning store are added to the cached listing directly,
+    so the store's own writes do not force a new listing, as long as the
+    directory had not changed since it was listed. A file another process
+    adds while the store is writing its own file is only seen after the
+    directory changes again.
+    """
+    
+    def __init__(self, path: str, prefix: str, suffix: str = '.json'):
+        """
+        Initialize the listing.
+        
+        Args:
+            path: Directory holding the files
+            prefix: File name prefix of the data files
+            suffix: File name suffix of the data files
+        """
+        self.path = path
+        self.prefix = prefix
+        self.suffix = suffix
+        self._mtime_ns: Optional[int] = None
+        self._names: List[str] = []
+    
+    def names(self) -> List[str]:
+        """
+        Get the data file names, newest first.
+        
+        File names embed a sortable timestamp, so name order is time order.
+        The returned list must not be modified.
+        
+        Returns:
+            List of file names
+        """
+        mtime_ns = self.mtime_ns()
+        if mtime_ns is None:
+            self._mtime_ns, self._names = None, []
+            return self._names
+        
+        if mtime_ns != self._mtime_ns:
+            names = [
+                f for f in os.listdir(self.path)
+                if f.startswith(self.prefix) and f.endswith(self.suffix)
+            ]
+            # A full sort rather than heapq.nlargest(limit): the whole listing
+            # is cached, and NTFS lists names in order, which Timsort handles
+            # in linear time
+            names.sort(reverse=True)
+            self._mtime_ns, self._names = mtime_ns, names
+        
+        return self._names
+    
+    def mtime_ns(self) -> Optional[int]:
+        """
+        Get the directory's current modification time.
+        
+        Returns:
+            Modification time in nanoseconds, or None if the directory is missing
+        """
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+    
+    def add(self, name: str, mtime_before: Optional[int]) -> None:
+        """
+        Record a file just written to the directory.
+        
+        Args:
+            name: File name of the written file
+            mtime_before: Directory modification time from mtime_ns() taken
+                just before the file was written
+        """
+        if self._mtime_ns is None:
+            return
+        
+        # Anything else changed the directory since it was listed: list it again
+        if mtime_before != self._mtime_ns:
+            self._mtime_ns, self._names = None, []
+            return
+        
+        mtime_ns = self.mtime_ns()
+        if mtime_ns is None:
+            self._mtime_ns, self._names = None, []
+            return
+        
+        # Replaced rather than modified, so a listing handed out stays intact
+        names = self._names
+        if name not in names:
+            names = sorted(names + [name], reverse=True)
+        self._mtime_ns, self._names = mtime_ns, names
+
 
 class RawDataStore:
     """
@@ -27,6 +228,10 @@ class RawDataStore:
         self.config = config
         self.logger = logging.getLogger('ambient_wifi_monitor.storage.raw')
         self.storage_path = self._get_storage_path()
+        self._listing = _DirectoryListing(self.storage_path, 'raw_')
+        # Joined with file names by concatenation in the save/list hot paths
+        self._path_prefix = os.path.join(self.storage_path, '')
+        self._dir_ready = False
     
     def _get_storage_path(self) -> str:
         """Get the base storage path for raw data."""
@@ -45,21 +250,24 @@ class RawDataStore:
         Returns:
             Path to saved file
         """
-        timestamp = collection_data.get('collection_timestamp', datetime.now().isoformat())
+        timestamp = collection_data.get('collection_timestamp') or datetime.now().isoformat()
         
         # Create timestamped filename
-        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-        filename = f"raw_{dt.strftime('%Y%m%d_%H%M%S')}.json"
-        filepath = os.path.join(self.storage_path, filename)
+        stamp, _ = _split_timestamp(timestamp)
+        filename = f"raw_{stamp}.json"
+        filepath = self._path_prefix + filename
         
-        # Ensure directory exists
-        os.makedirs(self.storage_path, exist_ok=True)
+        # The directory is created on the first save only
+        if not self._dir_ready:
+            os.makedirs(self.storage_path, exist_ok=True)
+            self._dir_ready = True
         
         # Save to JSON
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(collection_data, f, indent=2, ensure_ascii=False)
+        listed_mtime = self._listing.mtime_ns()
+        _dump_json(collection_data, filepath)
+        self._listing.add(filename, listed_mtime)
         
-        self.logger.info(f"Saved raw data to {filepath}")
+        self.logger.info("Saved raw data to %s", filepath)
         return filepath
     
     def load(self, filepath: str) -> Dict:
@@ -72,8 +280,7 @@ class RawDataStore:
         Returns:
             Raw collection dictionary
         """
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = _load_json(filepath)
         
         return data
     
@@ -87,19 +294,12 @@ class RawDataStore:
         Returns:
             List of file paths
         """
-        files = []
-        if os.path.exists(self.storage_path):
-            files = [
-                os.path.join(self.storage_path, f)
-                for f in os.listdir(self.storage_path)
-                if f.startswith('raw_') and f.endswith('.json')
-            ]
-            files.sort(reverse=True)
-        
+        names = self._listing.names()
         if limit:
-            files = files[:limit]
+            names = names[:limit]
         
-        return files
+        prefix = self._path_prefix
+        return [prefix + name for name in names]
 
 
 class NormalizedDataStore:
@@ -117,6 +317,16 @@ class NormalizedDataStore:
         self.config = config
         self.logger = logging.getLogger('ambient_wifi_monitor.storage.normalized')
         self.storage_path = self._get_storage_path()
+        self._listing = _DirectoryListing(self.storage_path, 'normalized_')
+        self._path_prefix = os.path.join(self.storage_path, '')
+        self._dir_ready = False
+        
+        # Buffered observations not yet written to disk, oldest first
+        self._pending: List[Dict] = []
+        
+        # BSSID history CSV, opened on first use and kept open for appends
+        self._csv_fh = None
+        atexit.register(self.close)
     
     def _get_storage_path(self) -> str:
         """Get the base storage path for normalized data."""
@@ -135,34 +345,69 @@ class NormalizedDataStore:
         Returns:
             Path to saved file
         """
-        timestamp = normalized_data.get('timestamp', datetime.now().isoformat())
+        timestamp = normalized_data.get('timestamp') or datetime.now().isoformat()
         
         # Create timestamped filename
-        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-        filename = f"normalized_{dt.strftime('%Y%m%d_%H%M%S')}.json"
-        filepath = os.path.join(self.storage_path, filename)
+        stamp, iso_timestamp = _split_timestamp(timestamp)
+        filename = f"normalized_{stamp}.json"
+        filepath = self._path_prefix + filename
         
-        # Ensure directory exists
-        os.makedirs(self.storage_path, exist_ok=True)
+        # The directory is created on the first save only
+        if not self._dir_ready:
+            os.makedirs(self.storage_path, exist_ok=True)
+            self._dir_ready = True
         
-        # Save to JSON
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(normalized_data, f, indent=2, ensure_ascii=False)
+        # Save to JSON (in-memory derived features are not persisted)
+        listed_mtime = self._listing.mtime_ns()
+        _dump_json({k: v for k, v in normalized_data.items() if k != '_derived'}, filepath)
+        self._listing.add(filename, listed_mtime)
         
-        self.logger.info(f"Saved normalized data to {filepath}")
+        self.logger.info("Saved normalized data to %s", filepath)
         
         # Also save to CSV for easy analysis
-        self._save_bssids_csv(normalized_data, dt)
+        self._save_bssids_csv(normalized_data, iso_timestamp)
         
         return filepath
     
-    def _save_bssids_csv(self, normalized_data: Dict, timestamp: datetime) -> None:
+    def buffer(self, normalized_data: Dict) -> None:
+        """
+        Hold normalized data in memory until the next flush().
+        
+        Buffered observations are returned by load_recent() as if they had
+        already been written.
+        
+        Args:
+            normalized_data: Normalized data dictionary
+        """
+        self._pending.append(normalized_data)
+    
+    def flush(self, limit: Optional[int] = None) -> int:
+        """
+        Write buffered observations to disk, oldest first.
+        
+        Each observation leaves the buffer only once it has been written, so
+        a failed write keeps it and the ones after it for the next flush.
+        
+        Args:
+            limit: Maximum number of observations to write (None = all)
+        
+        Returns:
+            Number of observations written
+        """
+        count = len(self._pending) if limit is None else min(limit, len(self._pending))
+        for _ in range(count):
+            self.save(self._pending[0])
+            del self._pending[0]
+        
+        return count
+    
+    def _save_bssids_csv(self, normalized_data: Dict, timestamp: str) -> None:
         """
         Save BSSID data to CSV for easy analysis.
         
         Args:
             normalized_data: Normalized data dictionary
-            timestamp: Observation timestamp
+            timestamp: Observation timestamp in ISO format
         """
         networks = normalized_data.get('wlan_networks', {})
         bssids = networks.get('bssids', [])
@@ -170,27 +415,31 @@ class NormalizedDataStore:
         if not bssids:
             return
         
-        csv_path = os.path.join(self.storage_path, 'bssids_history.csv')
-        file_exists = os.path.exists(csv_path)
-        
-        with open(csv_path, 'a', newline='', encoding='utf-8') as f:
-            fieldnames = ['timestamp', 'ssid', 'bssid', 'signal', 'channel', 'radio_type', 'authentication', 'encryption']
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            
-            if not file_exists:
-                writer.writeheader()
+        if self._csv_fh is None:
+            csv_path = os.path.join(self.storage_path, 'bssids_history.csv')
+            self._csv_fh = open(csv_path, 'a', newline='', encoding='utf-8')
             
-            for bssid in bssids:
-                writer.writerow({
-                    'timestamp': timestamp.isoformat(),
-                    'ssid': bssid.get('ssid', ''),
-                    'bssid': bssid.get('bssid', ''),
-                    'signal': bssid.get('signal', ''),
-                    'channel': bssid.get('channel', ''),
-                    'radio_type': bssid.get('radio_type', ''),
-                    'authentication': bssid.get('authentication', ''),
-                    'encryption': bssid.get('encryption', '')
-                })
+            # Append mode starts at the end of the file, so 0 means it is new
+            if self._csv_fh.tell() == 0:
+                self._csv_fh.write(_BSSID_CSV_HEADER)
+        
+        # Rows are formatted directly rather than through csv.DictWriter; the
+        # columns are fixed and _csv_field applies the same minimal quoting
+        field = _csv_field
+        self._csv_fh.write(''.join(
+            f"{timestamp},{field(bssid.get('ssid', ''))},{field(bssid.get('bssid', ''))},"
+            f"{field(bssid.get('signal', ''))},{field(bssid.get('channel', ''))},"
+            f"{field(bssid.get('radio_type', ''))},{field(bssid.get('authentication', ''))},"
+            f"{field(bssid.get('encryption', ''))}\r\n"
+            for bssid in bssids
+        ))
+        self._csv_fh.flush()
+    
+    def close(self) -> None:
+        """Close the BSSID history CSV; it is reopened by the next save."""
+        if self._csv_fh is not None:
+            self._csv_fh.close()
+            self._csv_fh = None
     
     def load(self, filepath: str) -> Dict:
         """
@@ -202,8 +451,7 @@ class NormalizedDataStore:
         Returns:
             Normalized data dictionary
         """
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = _load_json(filepath)
         
         return data
     
@@ -217,39 +465,70 @@ class NormalizedDataStore:
         Returns:
             List of file paths
         """
-        files = []
-        if os.path.exists(self.storage_path):
-            files = [
-                os.path.join(self.storage_path, f)
-                for f in os.listdir(self.storage_path)
-                if f.startswith('normalized_') and f.endswith('.json')
-            ]
-            files.sort(reverse=True)
-        
+        names = self._listing.names()
         if limit:
-            files = files[:limit]
+            names = names[:limit]
+        
+        prefix = self._path_prefix
+        return [prefix + name for name in names]
+    
+    def _prefetch(self, files: List[str]) -> None:
+        """
+        Ask the OS to start reading several files before they are parsed.
+        
+        On POSIX systems every file gets a POSIX_FADV_WILLNEED hint up front,
+        so the kernel can overlap the reads instead of them completing one
+        by one as each file is opened. This is a no-op where posix_fadvise is
+        unavailable (e.g. Windows).
         
-        return files
+        Args:
+            files: File paths about to be read
+        """
+        if len(files) < 2 or not hasattr(os, 'posix_fadvise'):
+            return
+        
+        for filepath in files:
+            try:
+                fd = os.open(filepath, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
     
-    def load_recent(self, count: int) -> List[Dict]:
+    def load_recent(self, count: int, offset: int = 0) -> List[Dict]:
         """
         Load the most recent normalized observations.
         
         Args:
             count: Number of observations to load
+            offset: Number of newest observations to skip first
         
         Returns:
-            List of normalized data dictionaries
+            List of normalized data dictionaries, newest first
         """
-        files = self.list_files(limit=count)
-        observations = []
+        # Buffered observations are newer than anything on disk
+        observations = self._pending[::-1][offset:offset + count]
+        
+        remaining = count - len(observations)
+        if remaining <= 0:
+            return observations
         
+        file_offset = max(0, offset - len(self._pending))
+        files = self.list_files(limit=file_offset + remaining)[file_offset:]
+        self._prefetch(files)
+        
+        # Parsed one by one: orjson holds the GIL while parsing and the reads
+        # were already queued by _prefetch, so worker threads only add overhead
         for filepath in files:
             try:
                 data = self.load(filepath)
                 observations.append(data)
             except Exception as e:
-                self.logger.error(f"Error loading {filepath}: {e}")
+                self.logger.error("Error loading %s: %s", filepath, e)
         
         return observations
 
@@ -269,6 +548,10 @@ class BaselineStore:
         self.config = config
         self.logger = logging.getLogger('ambient_wifi_monitor.storage.baseline')
         self.storage_path = self._get_storage_path()
+        self._dir_ready = False
+        
+        # Parsed baselines keyed by name, with the file mtime they were read at
+        self._cache: Dict[str, tuple] = {}
     
     def _get_storage_path(self) -> str:
         """Get the base storage path for baselines."""
@@ -291,20 +574,28 @@ class BaselineStore:
         filename = f"baseline_{name}.json"
         filepath = os.path.join(self.storage_path, filename)
         
-        # Ensure directory exists
-        os.makedirs(self.storage_path, exist_ok=True)
+        # The directory is created on the first save only
+        if not self._dir_ready:
+            os.makedirs(self.storage_path, exist_ok=True)
+            self._dir_ready = True
         
         # Save to JSON
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(baseline, f, indent=2, ensure_ascii=False)
+        _dump_json(baseline, filepath)
         
-        self.logger.info(f"Saved baseline '{name}' to {filepath}")
+        # Drop any memoized copy; the next load re-reads the file once
+        self._cache.pop(name, None)
+        
+        self.logger.info("Saved baseline '%s' to %s", name, filepath)
         return filepath
     
     def load(self, name: str = 'current') -> Optional[Dict]:
         """
         Load baseline model from disk.
         
+        The parsed baseline is memoized and reused for as long as the file's
+        modification time is unchanged, so repeated loads within a scan (or
+        across status queries) skip the JSON parse.
+        
         Args:
             name: Baseline identifier
         
@@ -314,12 +605,20 @@ class BaselineStore:
         filename = f"baseline_{name}.json"
         filepath = os.path.join(self.storage_path, filename)
         
-        if not os.path.exists(filepath):
-            self.logger.warning(f"Baseline '{name}' not found at {filepath}")
+        try:
+            mtime = os.stat(filepath).st_mtime_ns
+        except FileNotFoundError:
+            self._cache.pop(name, None)
+            self.logger.warning("Baseline '%s' not found at %s", name, filepath)
             return None
         
-        with open(filepath, 'r', encoding='utf-8') as f:
-            baseline = json.load(f)
+        cached = self._cache.get(name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        
+        baseline = _load_json(filepath)
+        
+        self._cache[name] = (mtime, baseline)
         
         return baseline
     
@@ -341,6 +640,10 @@ class BaselineStore:
 class MetadataStore:
     """
     Stores application metadata and observation counters.
+    
+    The metadata is read from disk once and then served from memory. Explicit
+    save() calls are written straight away; observation counter increments
+    are written back once every write_every of them and on flush().
     """
     
     def __init__(self, config: Dict):
@@ -353,6 +656,12 @@ class MetadataStore:
         self.config = config
         self.logger = logging.getLogger('ambient_wifi_monitor.storage.metadata')
         self.filepath = self._get_filepath()
+        
+        # Counter increments follow the observation write batching
+        self.write_every = max(1, config.get('storage', {}).get('batch_size', 1))
+        self._metadata: Optional[Dict] = None
+        self._unsaved_increments = 0
+        self._dir_ready = False
     
     def _get_filepath(self) -> str:
         """Get the metadata file path."""
@@ -362,18 +671,18 @@ class MetadataStore:
     
     def load(self) -> Dict:
         """
-        Load metadata from disk.
+        Load metadata, reading it from disk on first use.
         
         Returns:
-            Metadata dictionary
+            Metadata dictionary (shared; pass it to save() after changing it)
         """
-        if not os.path.exists(self.filepath):
-            return self._initialize_metadata()
-        
-        with open(self.filepath, 'r', encoding='utf-8') as f:
-            metadata = json.load(f)
+        if self._metadata is None:
+            if os.path.exists(self.filepath):
+                self._metadata = _load_json(self.filepath)
+            else:
+                self._metadata = self._initialize_metadata()
         
-        return metadata
+        return self._metadata
     
     def save(self, metadata: Dict) -> None:
         """
@@ -382,10 +691,21 @@ class MetadataStore:
         Args:
             metadata: Metadata dictionary
         """
-        os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+        # The directory is created on the first save only
+        if not self._dir_ready:
+            os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+            self._dir_ready = True
         
-        with open(self.filepath, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        _dump_json(metadata, self.filepath)
+        self._metadata = metadata
+        self._unsaved_increments = 0
+    
+    def flush(self) -> None:
+        """
+        Write metadata to disk if it has unsaved counter increments.
+        """
+        if self._unsaved_increments:
+            self.save(self._metadata)
     
     def _initialize_metadata(self) -> Dict:
         """
@@ -412,7 +732,11 @@ class MetadataStore:
         metadata = self.load()
         metadata['observation_count'] += 1
         metadata['last_observation'] = datetime.now().isoformat()
-        self.save(metadata)
+        
+        self._unsaved_increments += 1
+        if self._unsaved_increments >= self.write_every:
+            self.save(metadata)
+        
         return metadata['observation_count']
 
 
@@ -436,20 +760,71 @@ class StorageOrchestrator:
         self.normalized_store = NormalizedDataStore(config)
         self.baseline_store = BaselineStore(config)
         self.metadata_store = MetadataStore(config)
+        
+        # Write batching for save_observation_buffered()
+        storage_config = config.get('storage', {})
+        self.batch_size = max(1, storage_config.get('batch_size', 1))
+        self.flush_interval_s = storage_config.get('flush_interval_s', 300)
+        self._raw_buffer: List[Dict] = []
+        self._last_flush = time.monotonic()
+        
+        # Single background writer for files nothing reads back during a scan
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._pending_writes: List[Future] = []
+    
+    def submit_write(self, func: Callable, *args) -> Future:
+        """
+        Run a write operation on the background writer thread.
+        
+        Writes are executed one at a time in submission order. Call
+        wait_for_writes() before exit to surface any errors.
+        
+        Args:
+            func: Callable performing the write
+            *args: Arguments passed to func
+        
+        Returns:
+            Future for the write
+        """
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='storage-writer')
+        
+        self._pending_writes = [f for f in self._pending_writes if not f.done() or f.exception()]
+        future = self._writer.submit(func, *args)
+        self._pending_writes.append(future)
+        return future
+    
+    def wait_for_writes(self) -> None:
+        """
+        Block until all background writes have finished.
+        
+        Raises:
+            Exception: The first error raised by a background write
+        """
+        pending, self._pending_writes = self._pending_writes, []
+        for future in pending:
+            future.result()
     
-    def save_observation(self, raw_data: Dict, normalized_data: Dict) -> int:
+    def save_observation(self, raw_data: Dict, normalized_data: Dict,
+                         background: bool = False) -> int:
         """
         Save a complete observation (raw + normalized).
         
         Args:
             raw_data: Raw collection data
             normalized_data: Normalized data
+            background: Write the raw data on the background writer. Normalized
+                data is always written before returning because analysis
+                reads it back straight away.
         
         Returns:
             Observation number
         """
         # Save raw data
-        self.raw_store.save(raw_data)
+        if background:
+            self.submit_write(self.raw_store.save, raw_data)
+        else:
+            self.raw_store.save(raw_data)
         
         # Save normalized data
         self.normalized_store.save(normalized_data)
@@ -457,6 +832,76 @@ class StorageOrchestrator:
         # Increment observation counter
         obs_num = self.metadata_store.increment_observation()
         
-        self.logger.info(f"Saved observation #{obs_num}")
+        self.logger.info("Saved observation #%d", obs_num)
         
         return obs_num
+    
+    def observation_count(self) -> int:
+        """
+        Get the number of observations saved so far, including buffered ones.
+        
+        Returns:
+            Observation count
+        """
+        return self.metadata_store.load().get('observation_count', 0) + len(self._raw_buffer)
+    
+    def save_observation_buffered(self, raw_data: Dict, normalized_data: Dict) -> int:
+        """
+        Save a complete observation, batching disk writes.
+        
+        The observation is held in memory and written together with the rest
+        of the batch once batch_size observations are buffered or
+        flush_interval_s has passed since the last flush. Buffered normalized
+        data is still visible through normalized_store.load_recent().
+        
+        Args:
+            raw_data: Raw collection data
+            normalized_data: Normalized data
+        
+        Returns:
+            Observation number
+        """
+        self._raw_buffer.append(raw_data)
+        self.normalized_store.buffer(normalized_data)
+        
+        obs_num = self.metadata_store.load()['observation_count'] + len(self._raw_buffer)
+        
+        if (len(self._raw_buffer) >= self.batch_size or
+                time.monotonic() - self._last_flush >= self.flush_interval_s):
+            self.flush()
+        
+        self.logger.info("Buffered observation #%d", obs_num)
+        
+        return obs_num
+    
+    def flush(self) -> None:
+        """
+        Write all buffered observations and metadata, and wait for background writes.
+        """
+        self._last_flush = time.monotonic()
+        
+        # Observations leave the buffers only once written, so a failed write
+        # keeps the rest of the batch (and their numbers) for the next flush
+        written = 0
+        try:
+            for raw_data in self._raw_buffer:
+                self.raw_store.save(raw_data)
+                self.normalized_store.flush(1)
+                written += 1
+        finally:
+            if written:
+                last_raw = self._raw_buffer[written - 1]
+                del self._raw_buffer[:written]
+                
+                # One metadata write for the whole batch
+                metadata = self.metadata_store.load()
+                metadata['observation_count'] += written
+                metadata['last_observation'] = (
+                    last_raw.get('collection_timestamp') or datetime.now().isoformat()
+                )
+                self.metadata_store.save(metadata)
+                
+                self.logger.info("Flushed %d buffered observations", written)
+        
+        self.metadata_store.flush()
+        self.wait_for_writes()
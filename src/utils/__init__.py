@@ -4,11 +4,15 @@ Common utilities and helper functions.
 """
 
 import logging
+import logging.handlers
 import os
 from datetime import datetime
 from typing import Any, Dict
 import yaml
 
+# libyaml's C parser when PyYAML was built with it, else the pure-Python one
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 
 def setup_logging(config: Dict[str, Any]) -> logging.Logger:
     """
@@ -26,6 +30,10 @@ def setup_logging(config: Dict[str, Any]) -> logging.Logger:
     
     logger = logging.getLogger('ambient_wifi_monitor')
     logger.setLevel(level)
+    
+    # Closing flushes any records a previous buffered file handler still holds
+    for handler in logger.handlers:
+        handler.close()
     logger.handlers.clear()
     
     # Format
@@ -49,7 +57,19 @@ def setup_logging(config: Dict[str, Any]) -> logging.Logger:
         file_handler = logging.FileHandler(log_file)
         file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        
+        # Records are written in batches rather than one flushed write each;
+        # warnings and errors are written straight away together with the
+        # records before them. Logging's exit hook flushes the rest.
+        buffer_records = log_config.get('file_buffer_records', 100)
+        if buffer_records > 1:
+            buffered_handler = logging.handlers.MemoryHandler(
+                buffer_records, flushLevel=logging.WARNING, target=file_handler
+            )
+            buffered_handler.setLevel(level)
+            logger.addHandler(buffered_handler)
+        else:
+            logger.addHandler(file_handler)
     
     return logger
 
@@ -68,7 +88,7 @@ def load_config(config_path: str = 'config.yaml') -> Dict[str, Any]:
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
     
     with open(config_path, 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=_YAML_LOADER)
     
     return config
 
@@ -149,6 +169,19 @@ class ComplianceValidator:
         """
         self.compliance = config.get('compliance', {})
         self.logger = logging.getLogger('ambient_wifi_monitor.compliance')
+        
+        # Operations disabled by the configuration, which is fixed at runtime
+        self._prohibited = frozenset(
+            operation for operation, key in (
+                ('packet_sniffing', 'packet_sniffing_disabled'),
+                ('monitor_mode', 'monitor_mode_disabled'),
+                ('tracking', 'tracking_disabled'),
+                ('mac_tracking', 'mac_tracking_disabled'),
+                ('person_identification', 'person_identification_disabled'),
+                ('location_computation', 'location_computation_disabled'),
+            )
+            if self.compliance.get(key, True)
+        )
     
     def validate_operation(self, operation: str) -> bool:
         """
@@ -163,17 +196,8 @@ class ComplianceValidator:
         Raises:
             PermissionError: If operation violates compliance rules
         """
-        prohibited = {
-            'packet_sniffing': self.compliance.get('packet_sniffing_disabled', True),
-            'monitor_mode': self.compliance.get('monitor_mode_disabled', True),
-            'tracking': self.compliance.get('tracking_disabled', True),
-            'mac_tracking': self.compliance.get('mac_tracking_disabled', True),
-            'person_identification': self.compliance.get('person_identification_disabled', True),
-            'location_computation': self.compliance.get('location_computation_disabled', True),
-        }
-        
-        if operation in prohibited and prohibited[operation]:
-            self.logger.error(f"Prohibited operation attempted: {operation}")
+        if operation in self._prohibited:
+            self.logger.error("Prohibited operation attempted: %s", operation)
             raise PermissionError(
                 f"Operation '{operation}' is disabled by compliance configuration. "
                 "This tool is designed for ethical, read-only environmental analysis only."
@@ -189,4 +213,4 @@ class ComplianceValidator:
             resource: Resource being accessed
             purpose: Purpose of access
         """
-        self.logger.info(f"Data access - Resource: {resource}, Purpose: {purpose}")
+        self.logger.info("Data access - Resource: %s, Purpose: %s", resource, purpose)